@@ -1,7 +1,7 @@
 import streamlit as st
-import pickle
 import pandas as pd
 from fact_checker import EnhancedFactChecker, WebFactChecker
+from model_bundle import load_model_files
 
 # Page config
 st.set_page_config(
@@ -14,11 +14,8 @@ st.set_page_config(
 @st.cache_resource
 def load_model():
     try:
-        with open('model.pkl', 'rb') as f:
-            model = pickle.load(f)
-        with open('vectorizer.pkl', 'rb') as f:
-            vectorizer = pickle.load(f)
-        return model, vectorizer
+        # Memory-mapped bundle (fast cold start), legacy pickles as fallback
+        return load_model_files()
     except FileNotFoundError:
         st.error("⚠️ Model files not found! Run 'python train_and_save_model.py' first.")
         return None, None
@@ -183,7 +180,17 @@ if st.button("🔍 Analyze with Fact-Checking", type="primary", use_container_wi
             # Step 2: Fact Verification
             st.subheader("Step 2️⃣: Fact Verification")
             
-            if result['fact_verification']:
+            known_story = result.get('known_story')
+            if known_story:
+                st.warning(f"""
+                📰 **KNOWN STORY ({known_story['label'].upper()})**
+                
+                **Title:** {known_story['title']}  
+                **Dataset:** {known_story['source']} ({known_story['news_id']})  
+                **Similarity:** {known_story['similarity'] * 100:.0f}%  
+                **URL:** {known_story['url']}
+                """)
+            elif result['fact_verification']:
                 for fact in result['fact_verification']:
                     if fact['status'] == 'VERIFIED':
                         st.success(f"""
@@ -218,6 +225,19 @@ if st.button("🔍 Analyze with Fact-Checking", type="primary", use_container_wi
                     [Read more on Wikipedia]({wiki_info['url']})
                     """)
             
+            # Similar labeled stories from the dataset
+            try:
+                similar_stories = fact_checker.find_similar_stories(user_input, k=5)
+            except Exception as ex:
+                similar_stories = []
+                st.caption(f"⚠️ Similar stories unavailable: {ex}")
+            if similar_stories:
+                with st.expander("🗂️ Similar Known Stories (FakeNewsNet)"):
+                    for story in similar_stories:
+                        icon = "🔴" if story['label'] == 'fake' else "🟢"
+                        st.markdown(f"{icon} **{story['label'].upper()}** · {story['similarity'] * 100:.0f}% · "
+                                    f"{story['title']} ({story['source']}, {story['news_id']})")
+            
             # Step 3: Final Verdict
             st.subheader("Step 3️⃣: Final Verdict")
             
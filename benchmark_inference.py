@@ -0,0 +1,263 @@
+"""
+Inference Benchmark
+Measures the detector's inference path and writes machine readable results:
+  1. model bundle load time, ml_prediction p50/p99 latency, batch throughput
+  2. FreeFactChecker.verify_claim latency against a local Wikipedia stub,
+     with an empty cache, the SQLite cache tier only and a warm memory cache
+  3. peak RSS after each stage
+
+Pass --baseline with a previous results file to fail (exit code 1) on regressions
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import unquote
+
+import numpy as np
+
+from fact_checker import EnhancedFactChecker
+from free_fact_checker import FreeFactChecker
+from model_bundle import load_model_files
+from news_corpus import NEWS_SOURCES, iter_csv_records
+from wikipedia_client import summary_cache
+
+# Metric -> direction that counts as better, used by the baseline comparison
+TRACKED_METRICS = {
+    'model.load_ms_median': 'lower',
+    'model.ml_prediction.p50_ms': 'lower',
+    'model.ml_prediction.p99_ms': 'lower',
+    'model.batch_throughput.256': 'higher',
+    'fact_check.verify_claim.p50_ms': 'lower',
+    'fact_check.verify_claim.p99_ms': 'lower',
+    'fact_check.verify_claim_cached.p99_ms': 'lower',
+    'fact_check.verify_claim_disk_cache.p99_ms': 'lower',
+    'memory.peak_rss_mb': 'lower'
+}
+
+FACT_CHECK_CLAIMS = [
+    "The sun sets in the east",
+    "Donald Trump is president of America",
+    "Water boils at 100 degrees",
+    "Barack Obama visited New York City yesterday",
+    "NASA confirms Mars mission launch",
+    "Taylor Swift announces new album with Kanye West"
+]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentiles(latencies_ms):
+    latencies_ms = np.array(latencies_ms)
+    return {
+        'n': len(latencies_ms),
+        'mean_ms': round(float(latencies_ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p90_ms': round(float(np.percentile(latencies_ms, 90)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'max_ms': round(float(latencies_ms.max()), 4)
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def load_texts(dataset_dir, n):
+    texts = [record['title'] for record in islice(iter_csv_records(dataset_dir, NEWS_SOURCES), n)]
+    if not texts:
+        raise SystemExit(f"No dataset titles found in '{dataset_dir}'")
+    return texts
+
+
+def bench_model(texts, repeats, batch_sizes):
+    """Load time, single text latency and batch throughput of the ML layer"""
+    load_ms = [timed(load_model_files)[1] for _ in range(repeats)]
+    model, vectorizer = load_model_files()
+    checker = EnhancedFactChecker(model, vectorizer)
+
+    for text in texts[:20]:  # warm up (page in the mapped arrays)
+        checker.ml_prediction(text)
+    latencies = [timed(checker.ml_prediction, text)[1] for text in texts]
+
+    throughput = {}
+    for batch_size in batch_sizes:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        start = time.perf_counter()
+        for batch in batches:
+            checker.ml_prediction_batch(batch)
+        throughput[str(batch_size)] = round(len(texts) / (time.perf_counter() - start), 1)
+
+    return {
+        'load_ms_median': round(float(np.median(load_ms)), 3),
+        'load_ms_min': round(float(np.min(load_ms)), 3),
+        'single_scorer': checker.scorer is not None,
+        'ml_prediction': percentiles(latencies),
+        'batch_throughput': throughput
+    }
+
+
+class WikipediaStubHandler(BaseHTTPRequestHandler):
+    """Answers /page/summary/<title> like the Wikipedia REST API, after a fixed delay"""
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        title = unquote(self.path.rsplit('/', 1)[-1]).replace('_', ' ')
+        body = json.dumps({
+            'title': title,
+            'extract': f"{title} is a stub article used by the benchmark.",
+            'content_urls': {'desktop': {'page': f"https://en.wikipedia.org/wiki/{title}"}}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_wikipedia_stub(delay_ms):
+    handler = type('Handler', (WikipediaStubHandler,), {'delay': delay_ms / 1000})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_fact_check(rounds, delay_ms):
+    """
+    verify_claim latency with Wikipedia served locally (no network noise):
+    empty cache, SQLite tier only (memory cleared), and warm memory cache.
+    The cache is pointed at a temporary database, so WIKIPEDIA_CACHE_DB is
+    neither read (cold numbers stay cold) nor filled with stub responses.
+    """
+    server = start_wikipedia_stub(delay_ms)
+    original_disk_path = summary_cache.disk_path
+    tmp_dir = tempfile.mkdtemp(prefix='benchmark_cache_')
+    summary_cache.set_disk_path(os.path.join(tmp_dir, 'wikipedia_cache.db'))
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/page/summary/{{}}"
+        checker = FreeFactChecker(summary_url=url)
+        checker.verify_claim(FACT_CHECK_CLAIMS[0])  # warm up the connection pool
+
+        cold = []
+        for _ in range(rounds):
+            for claim in FACT_CHECK_CLAIMS:
+                summary_cache.clear(disk=True)
+                cold.append(timed(checker.verify_claim, claim)[1])
+
+        for claim in FACT_CHECK_CLAIMS:
+            checker.verify_claim(claim)
+        disk = []
+        for _ in range(rounds):
+            for claim in FACT_CHECK_CLAIMS:
+                summary_cache.clear()
+                disk.append(timed(checker.verify_claim, claim)[1])
+
+        for claim in FACT_CHECK_CLAIMS:
+            checker.verify_claim(claim)
+        warm = [timed(checker.verify_claim, claim)[1] for _ in range(rounds) for claim in FACT_CHECK_CLAIMS]
+    finally:
+        server.shutdown()
+        server.server_close()
+        summary_cache.clear()
+        summary_cache.set_disk_path(original_disk_path)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        'stub_delay_ms': delay_ms,
+        'verify_claim': percentiles(cold),
+        'verify_claim_disk_cache': percentiles(disk),
+        'verify_claim_cached': percentiles(warm)
+    }
+
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """List of regressions beyond tolerance (fraction) on the tracked metrics"""
+    current, previous = flatten(results), flatten(baseline)
+    regressions = []
+    for metric, better in TRACKED_METRICS.items():
+        if not isinstance(current.get(metric), (int, float)) or not previous.get(metric):
+            continue
+        change = (current[metric] - previous[metric]) / previous[metric]
+        if (better == 'lower' and change > tolerance) or (better == 'higher' and change < -tolerance):
+            regressions.append(f"{metric}: {previous[metric]} -> {current[metric]} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fake news detector inference path")
+    parser.add_argument('--dataset-dir', default='dataset')
+    parser.add_argument('--n-texts', type=int, default=2000, help="Dataset titles used as inputs")
+    parser.add_argument('--load-repeats', type=int, default=5)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 256])
+    parser.add_argument('--fact-check-rounds', type=int, default=20)
+    parser.add_argument('--stub-delay-ms', type=float, default=0.0,
+                        help="Simulated Wikipedia response time of the local stub")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Previous results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    texts = load_texts(args.dataset_dir, args.n_texts)
+    results = {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'memory': {'rss_mb_start': peak_rss_mb()}
+    }
+
+    print("⏱️ Model...")
+    results['model'] = bench_model(texts, args.load_repeats, args.batch_sizes)
+    results['memory']['rss_mb_after_model'] = peak_rss_mb()
+
+    print("⏱️ Fact checking (local Wikipedia stub)...")
+    results['fact_check'] = bench_fact_check(args.fact_check_rounds, args.stub_delay_ms)
+    results['memory']['peak_rss_mb'] = peak_rss_mb()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results saved to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,7 +39,8 @@ def init_config():
     json_object = json.load(open("config.json"))
 
     config = Config(json_object["dataset_dir"], json_object["dump_location"], json_object["tweet_keys_file"],
-                    int(json_object["num_process"]))
+                    int(json_object["num_process"]), int(json_object.get("user_timeline_depth", 200)),
+                    bool(json_object.get("delta_mode", False)), json_object.get("output_compression", "none"))
 
     data_choices = json_object["data_collection_choice"]
     data_features_to_collect = json_object["data_features_to_collect"]
@@ -64,6 +65,7 @@ def download_dataset():
     for feature_type in data_features_to_collect:
         data_collector = data_collector_factory.get_collector_object(feature_type)
         data_collector.collect_data(data_choices)
+        data_collector.save_dataset_snapshot(data_choices)
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from newspaper import Article
 from util.util import DataCollector
 from util.util import Config, create_dir
 from util import Constants
+from util.record_io import record_exists
 
 
 def crawl_link_article(url):
@@ -130,18 +131,26 @@ def collect_news_articles(news_list, news_source, label, config: Config):
     save_dir = "{}/{}/{}".format(config.dump_location, news_source, label)
 
     for news in tqdm(news_list):
+        # News items processed in an earlier run (delta mode) only have new tweets, the article is already collected
+        if not news.is_new:
+            continue
+
         create_dir("{}/{}".format(save_dir, news.news_id))
         news_article = crawl_news_article(news.news_url)
         if news_article:
-            json.dump(news_article,
-                      open("{}/{}/news content.json".format(save_dir, news.news_id), "w", encoding="UTF-8"))
+            config.record_writer.dump(news_article, "{}/{}/news content.json".format(save_dir, news.news_id))
 
 
 class NewsContentCollector(DataCollector):
 
+    feature_type = "news_articles"
+
     def __init__(self, config):
         super(NewsContentCollector, self).__init__(config)
 
+    def is_news_collected(self, news_dir, news):
+        return record_exists("{}/news content.json".format(news_dir))
+
     def collect_data(self, choices):
         for choice in choices:
             news_list = self.load_news_file(choice)
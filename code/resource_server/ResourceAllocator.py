@@ -3,6 +3,18 @@ import time
 from threading import Lock
 
 
+# Twitter API rate limits per resource type as (time_window, window_limit)
+RESOURCE_LIMITS = {
+    "get_retweet": (905, 75),
+    "get_tweet": (905, 900),
+    "get_follower_friends_ids": (920, 15),
+    "get_followers_ids": (900, 15),
+    "get_friends_ids": (900, 15),
+    "get_user": (905, 900),
+    "get_user_tweets": (925, 900),
+}
+
+
 class ResourceAllocator:
 
     def __init__(self, num_keys=34, time_window=900, window_limit=15):
@@ -26,31 +38,64 @@ class ResourceAllocator:
         if none of the resources are available, then send number of seconds until the resource is not available
         :return: Index resource if available otherwise time until none of the resources are available
         """
+        with self._lock:
+            return self.allocate()
+
+    def allocate(self):
+        """
+        Lock free version of get_resource_index. Callers must guarantee that allocations are not run concurrently,
+        e.g. by calling it only from a single event loop thread.
+        :return: Index resource if available otherwise time until none of the resources are available
+        """
         result = -1
         max_sleep_time = self.time_window
-        with self._lock:
-            while result == -1:
-                for i in range(0, self.num_keys):
-                    curr_sleep_time = max((self.timers[i][0] + self.time_window) - time.time(), 0)
+        now = time.time()
+
+        for i in range(0, self.num_keys):
+            timer = self.timers[i]
+            curr_sleep_time = max((timer[0] + self.time_window) - now, 0)
+
+            max_sleep_time = min(max_sleep_time, curr_sleep_time)
+
+            if timer[1] >= self.window_limit and timer[0] + self.time_window < now:
+                timer[0] = 0
+                timer[1] = 0
+
+            if timer[1] < self.window_limit:
+                result = i
+                break
+
+        if result == -1:  # case when all streams are rate limited
+            # logging.warning('sleeping for %d seconds.' % max_sleep_time)
+            # time.sleep(max_sleep_time)
+            return -1 * max_sleep_time
+
+        if self.timers[result][0] == 0:
+            self.timers[result][0] = now
 
-                    max_sleep_time = min(max_sleep_time, curr_sleep_time)
+        self.timers[result][1] += 1
 
-                    if self.timers[i][1] >= self.window_limit and self.timers[i][0] + self.time_window < time.time():
-                        self.timers[i][0] = 0
-                        self.timers[i][1] = 0
+        return result
 
-                    if self.timers[i][1] < self.window_limit:
-                        result = i
-                        break
 
-                if result == -1:  # case when all streams are rate limited
-                    # logging.warning('sleeping for %d seconds.' % max_sleep_time)
-                    # time.sleep(max_sleep_time)
-                    return -1 * max_sleep_time
+def create_keys_state(num_keys):
+    """
+    Creates one allocator per resource type configured with the Twitter rate limits of that resource
+    :param num_keys: Number of twitter keys available
+    :return: dict of resource type to ResourceAllocator
+    """
+    return {resource_type: ResourceAllocator(num_keys, time_window=time_window, window_limit=window_limit)
+            for resource_type, (time_window, window_limit) in RESOURCE_LIMITS.items()}
 
-            if self.timers[result][0] == 0:
-                self.timers[result][0] = time.time()
 
-            self.timers[result][1] += 1
+def get_allocation_response(resource_index):
+    """Returns the /get-keys response body for the resource index returned by an allocator"""
+    response = {}
+    if resource_index < 0:
+        response["status"] = 404
+        response["wait_time"] = abs(resource_index)
+    else:
+        response["status"] = 200
+        response["id"] = resource_index
 
-            return result
+    return response
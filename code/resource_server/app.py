@@ -5,7 +5,7 @@ from flask import jsonify
 from flask import request
 from flask_cors import CORS
 
-from resource_server.ResourceAllocator import ResourceAllocator
+from resource_server.ResourceAllocator import create_keys_state, get_allocation_response
 
 app = Flask(__name__)
 
@@ -16,13 +16,7 @@ keys_state = dict()
 
 def init_state(num_keys):
     print("No. of twitter keys : {}".format(num_keys))
-    keys_state["get_retweet"] = ResourceAllocator(num_keys, time_window=905, window_limit=75)
-    keys_state["get_tweet"] = ResourceAllocator(num_keys, time_window=905, window_limit=900)
-    keys_state["get_follower_friends_ids"] = ResourceAllocator(num_keys, time_window=920, window_limit=15)
-    keys_state["get_followers_ids"] = ResourceAllocator(num_keys, time_window=900, window_limit=15)
-    keys_state["get_friends_ids"] = ResourceAllocator(num_keys, time_window=900, window_limit=15)
-    keys_state["get_user"] = ResourceAllocator(num_keys, time_window=905, window_limit=900)
-    keys_state["get_user_tweets"] = ResourceAllocator(num_keys, time_window=925, window_limit=900)
+    keys_state.update(create_keys_state(num_keys))
 
 
 @app.route('/get-keys', methods=['GET'])
@@ -33,17 +27,7 @@ def get_key_index():
         type = args["resource_type"]
 
         allocator = keys_state[type]
-        resource_index = allocator.get_resource_index()
-
-        response = {}
-        if resource_index < 0:
-            response["status"] = 404
-            response["wait_time"] = abs(resource_index)
-        else:
-            response["status"] = 200
-            response["id"] = resource_index
-
-        return jsonify(response)
+        return jsonify(get_allocation_response(allocator.get_resource_index()))
 
     except Exception as ex:
         print(ex)
@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from aiohttp import web
+
+from resource_server.ResourceAllocator import create_keys_state, get_allocation_response
+
+# All handlers run on the single event loop thread, so allocations never race and the allocators are used through
+# their lock free `allocate` method.
+
+
+async def get_key_index(request):
+    keys_state = request.app["keys_state"]
+
+    try:
+        allocator = keys_state[request.query["resource_type"]]
+        return web.json_response(get_allocation_response(allocator.allocate()))
+
+    except Exception as ex:
+        print(ex)
+
+    return web.json_response({'result': 500})
+
+
+def create_app(num_keys):
+    print("No. of twitter keys : {}".format(num_keys))
+    app = web.Application()
+    app["keys_state"] = create_keys_state(num_keys)
+    app.router.add_get('/get-keys', get_key_index)
+    return app
+
+
+def get_num_process():
+    json_object = json.load(open("config.json"))
+    return int(json_object["num_twitter_keys"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Asynchronous twitter keys management server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+
+    web.run_app(create_app(get_num_process()), host=args.host, port=args.port, access_log=None)
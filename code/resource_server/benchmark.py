@@ -0,0 +1,71 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import local
+
+import requests
+
+from util import Constants
+
+_thread_state = local()
+
+
+def _get_session():
+    if not hasattr(_thread_state, "session"):
+        _thread_state.session = requests.Session()
+    return _thread_state.session
+
+
+def _timed_request(url):
+    start = time.perf_counter()
+    response = _get_session().get(url)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(server, resource_type, num_requests, concurrency):
+    """
+    Fires num_requests /get-keys requests at the keys server using concurrency parallel clients, the same way the
+    collector processes do, and returns throughput and latency statistics
+    """
+    url = "http://{}/get-keys?resource_type={}".format(server, resource_type)
+
+    # Warm up connections so that connection setup is not part of the measurement
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(_timed_request, [url] * concurrency))
+
+        start = time.perf_counter()
+        latencies = sorted(executor.map(_timed_request, [url] * num_requests))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "server": server,
+        "resource_type": resource_type,
+        "requests": num_requests,
+        "concurrency": concurrency,
+        "requests_per_second": num_requests / elapsed,
+        "latency_ms_p50": percentile(latencies, 0.50) * 1000,
+        "latency_ms_p99": percentile(latencies, 0.99) * 1000,
+        "latency_ms_max": latencies[-1] * 1000,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the twitter keys management server. Run it against a "
+                                                 "server that is not used for data collection as the benchmark "
+                                                 "consumes the key allocations.")
+    parser.add_argument("--servers", nargs="+", default=["localhost:5000"],
+                        help="host:port of the servers to compare, e.g. the flask and the async server")
+    parser.add_argument("--resource-type", default=Constants.GET_TWEET)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    for server in args.servers:
+        print(json.dumps(run_benchmark(server, args.resource_type, args.requests, args.concurrency)))
@@ -1,4 +1,3 @@
-import json
 import logging
 from twython import TwythonError, TwythonRateLimitError
 
@@ -9,6 +8,7 @@ from util.util import create_dir, Config, multiprocess_data_collection
 
 from util.util import DataCollector
 from util import Constants
+from util.record_io import record_exists
 
 
 def dump_retweets_job(tweet: Tweet, config: Config, twython_connector: TwythonConnector):
@@ -20,10 +20,13 @@ def dump_retweets_job(tweet: Tweet, config: Config, twython_connector: TwythonCo
 
     except TwythonRateLimitError:
         logging.exception("Twython API rate limit exception - tweet id : {}".format(tweet.tweet_id))
+        # Nothing is written, so that the tweet is not taken as collected and is retried by the next run
+        return
 
     except Exception:
         logging.exception(
             "Exception in getting retweets for tweet id %d using connection %s" % (tweet.tweet_id, connection))
+        return
 
     retweet_obj = {"retweets": retweets}
 
@@ -31,7 +34,7 @@ def dump_retweets_job(tweet: Tweet, config: Config, twython_connector: TwythonCo
     retweet_dir = "{}/retweets".format(dump_dir)
     create_dir(dump_dir)
     create_dir(retweet_dir)
-    json.dump(retweet_obj, open("{}/{}.json".format(retweet_dir, tweet.tweet_id), "w"))
+    config.record_writer.dump(retweet_obj, "{}/{}.json".format(retweet_dir, tweet.tweet_id))
 
 
 def collect_retweets(news_list, news_source, label, config: Config):
@@ -52,9 +55,14 @@ def collect_retweets(news_list, news_source, label, config: Config):
 
 class RetweetCollector(DataCollector):
 
+    feature_type = "retweets"
+
     def __init__(self, config):
         super(RetweetCollector, self).__init__(config)
 
+    def is_tweet_collected(self, news_dir, tweet_id):
+        return record_exists("{}/retweets/{}.json".format(news_dir, tweet_id))
+
     def collect_data(self, choices):
         for choice in choices:
             news_list = self.load_news_file(choice)
@@ -1,4 +1,3 @@
-import json
 import logging
 from multiprocessing.pool import Pool
 
@@ -9,6 +8,7 @@ from util.util import create_dir, Config, multiprocess_data_collection
 
 from util.util import DataCollector
 from util import Constants
+from util.record_io import record_exists
 
 from util.util import equal_chunks
 
@@ -41,7 +41,7 @@ def dump_tweet_information(tweet_chunk: list, config: Config, twython_connector:
                 create_dir(dump_dir)
                 create_dir(tweet_dir)
 
-                json.dump(tweet_object, open("{}/{}.json".format(tweet_dir, tweet.tweet_id), "w"))
+                config.record_writer.dump(tweet_object, "{}/{}.json".format(tweet_dir, tweet.tweet_id))
 
     except TwythonRateLimitError:
         logging.exception("Twython API rate limit exception")
@@ -71,9 +71,14 @@ def collect_tweets(news_list, news_source, label, config: Config):
 
 class TweetCollector(DataCollector):
 
+    feature_type = "tweets"
+
     def __init__(self, config):
         super(TweetCollector, self).__init__(config)
 
+    def is_tweet_collected(self, news_dir, tweet_id):
+        return record_exists("{}/tweets/{}.json".format(news_dir, tweet_id))
+
     def collect_data(self, choices):
         for choice in choices:
             news_list = self.load_news_file(choice)
@@ -1,17 +1,19 @@
-import json
 import logging
 import os
-from pathlib import Path
 from twython import TwythonError, TwythonRateLimitError
 
 from util.Constants import GET_USER, GET_USER_TWEETS, USER_ID, FOLLOWERS, GET_FRIENDS_ID, FOLLOWING
 from util.TwythonConnector import TwythonConnector
+from util.record_io import RecordWriter, find_record, load_record, record_exists
 from util.util import Config, is_folder_exists, create_dir, multiprocess_data_collection
 
 from util.util import DataCollector
 
 from util.Constants import GET_FOLLOWERS_ID
 
+# Maximum number of tweets returned by a single user timeline API call
+USER_TIMELINE_PAGE_SIZE = 200
+
 
 def get_user_ids_in_folder(samples_folder):
     user_ids = set()
@@ -22,18 +24,18 @@ def get_user_ids_in_folder(samples_folder):
         if is_folder_exists(news_dir) and is_folder_exists(tweets_dir):
 
             for tweet_file in os.listdir(tweets_dir):
-                tweet_object = json.load(open("{}/{}".format(tweets_dir, tweet_file)))
+                tweet_object = load_record("{}/{}".format(tweets_dir, tweet_file))
 
                 user_ids.add(tweet_object["user"]["id"])
 
     return user_ids
 
 
-def dump_user_profile_job(user_id, save_location, twython_connector: TwythonConnector):
+def dump_user_profile_job(user_id, save_location, twython_connector: TwythonConnector, record_writer: RecordWriter):
     profile_info = None
 
     # Fetch and save user information if the file is not already present
-    if not Path("{}/{}.json".format(save_location, user_id)).is_file():
+    if not record_exists("{}/{}.json".format(save_location, user_id)):
         try:
             profile_info = twython_connector.get_twython_connection(GET_USER).show_user(user_id=user_id)
 
@@ -42,24 +44,71 @@ def dump_user_profile_job(user_id, save_location, twython_connector: TwythonConn
 
         finally:
             if profile_info:
-                json.dump(profile_info, open("{}/{}.json".format(save_location, user_id), "w"))
+                record_writer.dump(profile_info, "{}/{}.json".format(save_location, user_id))
 
 
-def dump_user_recent_tweets_job(user_id, save_location, twython_connector: TwythonConnector):
-    profile_info = None
+def fetch_user_timeline(user_id, twython_connector: TwythonConnector, max_tweets, timeline_tweets, since_id=None):
+    """
+    Pages back through the user timeline using max_id and appends the tweets to timeline_tweets (newest first)
+    :param max_tweets: Maximum number of tweets to fetch
+    :param timeline_tweets: List to which the fetched tweets are appended, holds the partial result if an API call fails
+    :param since_id: If given, only the tweets newer than since_id are fetched
+    """
+    max_id = None
 
-    # Fetch and save user information if the file is not already present
-    if not Path("{}/{}.json".format(save_location, user_id)).is_file():
-        try:
-            profile_info = twython_connector.get_twython_connection(GET_USER_TWEETS).get_user_timeline(user_id=user_id,
-                                                                                                       count=200)
+    while len(timeline_tweets) < max_tweets:
+        params = {"user_id": user_id, "count": min(USER_TIMELINE_PAGE_SIZE, max_tweets - len(timeline_tweets))}
+        if since_id:
+            params["since_id"] = since_id
+        if max_id:
+            params["max_id"] = max_id
 
-        except TwythonRateLimitError as ex:
+        tweets = twython_connector.get_twython_connection(GET_USER_TWEETS).get_user_timeline(**params)
+        if not tweets:
+            break
+
+        timeline_tweets.extend(tweets)
+        max_id = tweets[-1]["id"] - 1
+
+
+def dump_user_recent_tweets_job(user_id, save_location, twython_connector: TwythonConnector,
+                                record_writer: RecordWriter, timeline_depth=200):
+    timeline_file = "{}/{}.json".format(save_location, user_id)
+
+    # If the timeline is already present, only fetch the tweets newer than the stored ones and add them to the file,
+    # keeping the timeline_depth most recent tweets
+    stored_tweets = []
+    stored_file = find_record(timeline_file)
+    if stored_file:
+        stored_tweets = load_record(stored_file)
+
+    since_id = max(tweet["id"] for tweet in stored_tweets) if stored_tweets else None
+
+    new_tweets = []
+    try:
+        fetch_user_timeline(user_id, twython_connector, timeline_depth, new_tweets, since_id)
+
+    except Exception as ex:
+        if isinstance(ex, TwythonRateLimitError):
             logging.exception("Twython API rate limit exception")
+        else:
+            logging.exception("Exception in getting timeline tweets for user : {}".format(user_id))
 
-        finally:
-            if profile_info:
-                json.dump(profile_info, open("{}/{}.json".format(save_location, user_id), "w"))
+        # Partial refresh would leave a gap between the stored and the fetched tweets which is never filled
+        if since_id:
+            new_tweets = []
+
+    if new_tweets:
+        if len(new_tweets) >= timeline_depth:
+            # The fetch stopped at the depth before reaching the stored tweets, merging would leave a gap
+            timeline_tweets = new_tweets[:timeline_depth]
+        else:
+            timeline_tweets = (new_tweets + stored_tweets)[:timeline_depth]
+        written_file = record_writer.dump(timeline_tweets, timeline_file)
+
+        # Timeline stored with a different compression is replaced by the updated file
+        if stored_file and stored_file != written_file:
+            os.remove(stored_file)
 
 
 def fetch_user_follower_ids(user_id, twython_connection):
@@ -86,29 +135,29 @@ def fetch_user_friends_ids(user_id, twython_connection):
     return user_friends
 
 
-def dump_user_followers(user_id, save_location, twython_connector: TwythonConnector):
+def dump_user_followers(user_id, save_location, twython_connector: TwythonConnector, record_writer: RecordWriter):
 
     # Fetch and save user information if the file is not already present
-    if not Path("{}/{}.json".format(save_location, user_id)).is_file():
+    if not record_exists("{}/{}.json".format(save_location, user_id)):
         try:
             user_followers = fetch_user_follower_ids(user_id, twython_connector.get_twython_connection(GET_FOLLOWERS_ID))
 
             user_followers_info = {USER_ID: user_id, FOLLOWERS: user_followers}
-            json.dump(user_followers_info, open("{}/{}.json".format(save_location, user_id), "w"))
+            record_writer.dump(user_followers_info, "{}/{}.json".format(save_location, user_id))
 
         except:
             logging.exception("Exception in getting follower_ids for user : {}".format(user_id))
 
 
-def dump_user_following(user_id, save_location, twython_connector: TwythonConnector):
+def dump_user_following(user_id, save_location, twython_connector: TwythonConnector, record_writer: RecordWriter):
 
     # Fetch and save user information if the file is not already present
-    if not Path("{}/{}.json".format(save_location, user_id)).is_file():
+    if not record_exists("{}/{}.json".format(save_location, user_id)):
         try:
             user_following = fetch_user_friends_ids(user_id, twython_connector.get_twython_connection(GET_FRIENDS_ID))
 
             user_following_info = {USER_ID: user_id,FOLLOWING : user_following}
-            json.dump(user_following_info, open("{}/{}.json".format(save_location, user_id), "w"))
+            record_writer.dump(user_following_info, "{}/{}.json".format(save_location, user_id))
 
         except:
             logging.exception("Exception in getting follower_ids for user : {}".format(user_id))
@@ -131,87 +180,138 @@ def collect_user_profiles(config: Config, twython_connector: TwythonConnector):
     create_dir(user_profiles_folder)
     create_dir(user_timeline_tweets_folder)
 
-    multiprocess_data_collection(dump_user_profile_job, all_user_ids, (user_profiles_folder, twython_connector), config)
+    multiprocess_data_collection(dump_user_profile_job, all_user_ids, (user_profiles_folder, twython_connector,
+                                                                       config.record_writer), config)
     multiprocess_data_collection(dump_user_recent_tweets_job, all_user_ids, (user_timeline_tweets_folder,
-                                                                             twython_connector), config)
+                                                                             twython_connector,
+                                                                             config.record_writer,
+                                                                             config.user_timeline_depth), config)
 
 
-class UserProfileCollector(DataCollector):
+def get_user_ids_of_tweets(samples_folder, news_list):
+    """Returns the ids of the users who posted the tweets of the news list, reading only the tweets of the list"""
+    user_ids = set()
 
-    def __init__(self, config):
-        super(UserProfileCollector, self).__init__(config)
+    for news in news_list:
+        tweets_dir = "{}/{}/tweets".format(samples_folder, news.news_id)
 
-    def collect_data(self, choices):
+        for tweet_id in news.tweet_ids:
+            tweet_file = find_record("{}/{}.json".format(tweets_dir, tweet_id))
+            if tweet_file:
+                tweet_object = load_record(tweet_file)
+                user_ids.add(tweet_object["user"]["id"])
+
+    return user_ids
+
+
+class UserDataCollector(DataCollector):
+
+    # Folder in the dump location holding one record per user
+    user_folder = None
+
+    def is_tweet_collected(self, news_dir, tweet_id):
+        # The user of a tweet which is not collected yet is unknown, the tweet is checked again by the next run
+        tweet_file = find_record("{}/tweets/{}.json".format(news_dir, tweet_id))
+        if tweet_file is None:
+            return False
+
+        user_id = load_record(tweet_file)["user"]["id"]
+        return record_exists("{}/{}/{}.json".format(self.config.dump_location, self.user_folder, user_id))
+
+    def get_user_ids(self, choices):
+        """
+        Returns the ids of the users involved in the tweets of the choices. In delta mode, only the users of the tweets
+        added to the dataset since the last run of the collector are returned.
+        """
         all_user_ids = set()
 
         for choice in choices:
-            all_user_ids.update(get_user_ids_in_folder(
-                "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])))
+            samples_folder = "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])
+
+            if self.config.delta_mode:
+                all_user_ids.update(get_user_ids_of_tweets(samples_folder, self.load_news_file(choice)))
+            else:
+                all_user_ids.update(get_user_ids_in_folder(samples_folder))
+
+        return all_user_ids
+
+
+class UserProfileCollector(UserDataCollector):
+
+    feature_type = "user_profile"
+    user_folder = "user_profiles"
+
+    def __init__(self, config):
+        super(UserProfileCollector, self).__init__(config)
+
+    def collect_data(self, choices):
+        all_user_ids = self.get_user_ids(choices)
 
-        user_profiles_folder = "{}/{}".format(self.config.dump_location, "user_profiles")
+        user_profiles_folder = "{}/{}".format(self.config.dump_location, self.user_folder)
         create_dir(user_profiles_folder)
 
         multiprocess_data_collection(dump_user_profile_job, list(all_user_ids),
-                                     (user_profiles_folder, self.config.twython_connector),
+                                     (user_profiles_folder, self.config.twython_connector,
+                                      self.config.record_writer),
                                      self.config)
 
 
-class UserTimelineTweetsCollector(DataCollector):
+class UserTimelineTweetsCollector(UserDataCollector):
+
+    feature_type = "user_timeline_tweets"
+    user_folder = "user_timeline_tweets"
 
     def __init__(self, config):
         super(UserTimelineTweetsCollector, self).__init__(config)
 
     def collect_data(self, choices):
-        all_user_ids = set()
-
-        for choice in choices:
-            all_user_ids.update(get_user_ids_in_folder(
-                "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])))
+        all_user_ids = self.get_user_ids(choices)
 
-        user_timeline_tweets_folder = "{}/{}".format(self.config.dump_location, "user_timeline_tweets")
+        user_timeline_tweets_folder = "{}/{}".format(self.config.dump_location, self.user_folder)
         create_dir(user_timeline_tweets_folder)
 
         multiprocess_data_collection(dump_user_recent_tweets_job, list(all_user_ids), (user_timeline_tweets_folder,
-                                                                                       self.config.twython_connector),
+                                                                                       self.config.twython_connector,
+                                                                                       self.config.record_writer,
+                                                                                       self.config.user_timeline_depth),
                                      self.config)
 
 
-class UserFollowersCollector(DataCollector):
+class UserFollowersCollector(UserDataCollector):
+
+    feature_type = "user_followers"
+    user_folder = "user_followers"
 
     def __init__(self, config):
         super(UserFollowersCollector, self).__init__(config)
 
     def collect_data(self, choices):
-        all_user_ids = set()
+        all_user_ids = self.get_user_ids(choices)
 
-        for choice in choices:
-            all_user_ids.update(get_user_ids_in_folder(
-                "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])))
-
-        user_followers_folder = "{}/{}".format(self.config.dump_location, "user_followers")
+        user_followers_folder = "{}/{}".format(self.config.dump_location, self.user_folder)
         create_dir(user_followers_folder)
 
         multiprocess_data_collection(dump_user_followers, list(all_user_ids), (user_followers_folder,
-                                                                                       self.config.twython_connector),
+                                                                                       self.config.twython_connector,
+                                                                                       self.config.record_writer),
                                      self.config)
 
 
-class UserFollowingCollector(DataCollector):
+class UserFollowingCollector(UserDataCollector):
+
+    feature_type = "user_following"
+    user_folder = "user_following"
 
     def __init__(self, config):
         super(UserFollowingCollector, self).__init__(config)
 
     def collect_data(self, choices):
-        all_user_ids = set()
+        all_user_ids = self.get_user_ids(choices)
 
-        for choice in choices:
-            all_user_ids.update(get_user_ids_in_folder(
-                "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])))
-
-        user_friends_folder = "{}/{}".format(self.config.dump_location, "user_following")
+        user_friends_folder = "{}/{}".format(self.config.dump_location, self.user_folder)
         create_dir(user_friends_folder)
 
         multiprocess_data_collection(dump_user_following, list(all_user_ids), (user_friends_folder,
-                                                                                       self.config.twython_connector),
+                                                                                       self.config.twython_connector,
+                                                                                       self.config.record_writer),
                                      self.config)
-
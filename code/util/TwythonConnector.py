@@ -13,6 +13,8 @@ class TwythonConnector:
         self.init_twython_objects(key_file)
         self.url = "http://" + keys_server_url + "/get-keys?resource_type="
         self.max_fail_count = 3
+        # Keep alive connection to the keys server, saves a TCP handshake on every API call
+        self.session = requests.Session()
 
     def init_twython_objects(self, keys_file):
         """
@@ -62,7 +64,7 @@ class TwythonConnector:
         # TODO: IMPORTANT! - Avoid this infinite waiting and use a heap to add those processes and check heap before
         # consuming message from Kafka
         while True:
-            response = requests.get(self.url + resource_type)
+            response = self.session.get(self.url + resource_type)
             if response.status_code == 200:
                 response = json.loads(response.text)
                 if response["status"] == 200:
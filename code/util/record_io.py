@@ -0,0 +1,129 @@
+import gzip
+import json
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File name suffix added to the record file name for each compression
+COMPRESSION_SUFFIXES = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def dumps_json(obj):
+    """Serializes the object to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter than json (e.g. integers beyond 64 bits, non string keys)
+            pass
+
+    return json.dumps(obj).encode("UTF-8")
+
+
+def loads_json(data):
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+class RecordWriter:
+    """
+    Writes collected records (tweets, retweets, news content, user information) as JSON files, optionally compressed.
+    The compression suffix is added to the given file name, e.g. `<tweet_id>.json.zst`.
+    """
+
+    def __init__(self, compression="none", compression_level=None):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError("Unknown compression {}, expected one of {}".format(compression,
+                                                                                list(COMPRESSION_SUFFIXES)))
+
+        if compression == "zstd" and zstandard is None:
+            logging.warning("zstandard is not installed, falling back to gzip compression")
+            compression = "gzip"
+
+        self.compression = compression
+        self.compression_level = compression_level
+
+    def get_file_path(self, path):
+        return path + COMPRESSION_SUFFIXES[self.compression]
+
+    def dump(self, obj, path):
+        """
+        Writes the object to the record file
+        :param path: File path of the uncompressed record, e.g. `tweets/<tweet_id>.json`
+        :return: Path of the written file
+        """
+        data = dumps_json(obj)
+
+        if self.compression == "gzip":
+            data = gzip.compress(data, compresslevel=self.compression_level or 6)
+        elif self.compression == "zstd":
+            data = zstandard.ZstdCompressor(level=self.compression_level or 3).compress(data)
+
+        file_path = self.get_file_path(path)
+        with open(file_path, "wb") as file:
+            file.write(data)
+
+        return file_path
+
+
+def find_record(path):
+    """
+    Returns the path of the file storing the record, whichever compression it was written with
+    :param path: File path of the uncompressed record
+    :return: Path of the record file, None if the record does not exist
+    """
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if os.path.isfile(path + suffix):
+            return path + suffix
+
+    return None
+
+
+def record_exists(path):
+    return find_record(path) is not None
+
+
+def get_record_name(file_name):
+    """Returns the uncompressed record file name of a file name in a dump folder, e.g. `<tweet_id>.json`"""
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if suffix and file_name.endswith(suffix):
+            return file_name[:-len(suffix)]
+
+    return file_name
+
+
+def load_record(path):
+    """
+    Reads a record written by RecordWriter, decompressing it if required
+    :param path: Path of the record file or the file path of the uncompressed record
+    """
+    file_path = path if os.path.isfile(path) else find_record(path)
+    if file_path is None:
+        raise FileNotFoundError(path)
+
+    with open(file_path, "rb") as file:
+        data = file.read()
+
+    if file_path.endswith(COMPRESSION_SUFFIXES["gzip"]):
+        data = gzip.decompress(data)
+    elif file_path.endswith(COMPRESSION_SUFFIXES["zstd"]):
+        if zstandard is None:
+            raise ImportError("zstandard is required to read {}".format(file_path))
+        data = zstandard.ZstdDecompressor().decompress(data)
+
+    return loads_json(data)
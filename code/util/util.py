@@ -1,5 +1,6 @@
 import csv
 import errno
+import json
 import os
 import sys
 from multiprocessing.pool import Pool
@@ -7,6 +8,7 @@ from multiprocessing.pool import Pool
 from tqdm import tqdm
 
 from util.TwythonConnector import TwythonConnector
+from util.record_io import RecordWriter
 
 
 class News:
@@ -26,15 +28,22 @@ class News:
         self.label = label
         self.platform = news_platform
 
+        # False if the news item was processed in an earlier run and only its new tweet ids are to be collected
+        self.is_new = True
+
 
 
 class Config:
 
-    def __init__(self, data_dir, data_collection_dir, tweet_keys_file, num_process):
+    def __init__(self, data_dir, data_collection_dir, tweet_keys_file, num_process, user_timeline_depth=200,
+                 delta_mode=False, output_compression="none"):
         self.dataset_dir = data_dir
         self.dump_location = data_collection_dir
         self.tweet_keys_file = tweet_keys_file
         self.num_process = num_process
+        self.user_timeline_depth = user_timeline_depth
+        self.delta_mode = delta_mode
+        self.record_writer = RecordWriter(output_compression)
 
         self.twython_connector = TwythonConnector("localhost:5000", tweet_keys_file)
 
@@ -42,6 +51,9 @@ class Config:
 
 class DataCollector:
 
+    # Name of the feature in data_features_to_collect, used to track the news items processed by the collector
+    feature_type = None
+
     def __init__(self, config):
         self.config = config
 
@@ -49,25 +61,126 @@ class DataCollector:
         pass
 
     def load_news_file(self, data_choice):
-        maxInt = sys.maxsize
-        while True:
-            # decrease the maxInt value by factor 10
-            # as long as the OverflowError occurs.
-            try:
-                csv.field_size_limit(maxInt)
-                break
-            except OverflowError:
-                maxInt = int(maxInt / 10)
-
-        news_list = []
-        with open('{}/{}_{}.csv'.format(self.config.dataset_dir, data_choice["news_source"],
-                                        data_choice["label"]), encoding="UTF-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for news in reader:
-                news_list.append(News(news, data_choice["label"], data_choice["news_source"]))
+        """
+        Loads the news list of the data choice. In delta mode, only the news items and tweet ids added to the dataset
+        since the last run of the collector are returned.
+        """
+        news_list = load_news_list(self.config.dataset_dir, data_choice)
+
+        if self.config.delta_mode:
+            news_list = get_news_delta(news_list, load_dataset_snapshot(self.config, self.feature_type, data_choice))
 
         return news_list
 
+    def is_news_collected(self, news_dir, news):
+        """True if the output of the collector for the news item itself is present (tweets are checked separately)"""
+        return True
+
+    def is_tweet_collected(self, news_dir, tweet_id):
+        """True if the output of the collector for the tweet of the news item in news_dir is present"""
+        return True
+
+    def save_dataset_snapshot(self, choices):
+        """
+        Records the news items and tweet ids of the choices as processed by the collector. Only the items whose output
+        is present are recorded, the ones that failed are picked up again by the next run in delta mode.
+        """
+        for choice in choices:
+            news_list = load_news_list(self.config.dataset_dir, choice)
+            snapshot = dict()
+
+            if self.config.delta_mode:
+                # Items of the last snapshot were checked then, only the delta of this run needs to be checked
+                snapshot = load_dataset_snapshot(self.config, self.feature_type, choice)
+                news_list = get_news_delta(news_list, snapshot)
+
+            save_dir = "{}/{}/{}".format(self.config.dump_location, choice["news_source"], choice["label"])
+            for news in news_list:
+                news_dir = "{}/{}".format(save_dir, news.news_id)
+                if news.is_new and not self.is_news_collected(news_dir, news):
+                    continue
+
+                collected_tweet_ids = [tweet_id for tweet_id in news.tweet_ids
+                                       if self.is_tweet_collected(news_dir, tweet_id)]
+                snapshot[news.news_id] = snapshot.get(news.news_id, []) + collected_tweet_ids
+
+            save_dataset_snapshot(self.config, self.feature_type, choice, snapshot)
+
+
+def load_news_list(dataset_dir, data_choice):
+    maxInt = sys.maxsize
+    while True:
+        # decrease the maxInt value by factor 10
+        # as long as the OverflowError occurs.
+        try:
+            csv.field_size_limit(maxInt)
+            break
+        except OverflowError:
+            maxInt = int(maxInt / 10)
+
+    news_list = []
+    with open('{}/{}_{}.csv'.format(dataset_dir, data_choice["news_source"],
+                                    data_choice["label"]), encoding="UTF-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for news in reader:
+            news_list.append(News(news, data_choice["label"], data_choice["news_source"]))
+
+    return news_list
+
+
+def get_snapshot_file(config, feature_type, data_choice):
+    return "{}/dataset_snapshots/{}/{}_{}.json".format(config.dump_location, feature_type, data_choice["news_source"],
+                                                       data_choice["label"])
+
+
+def load_dataset_snapshot(config, feature_type, data_choice):
+    """
+    Returns the snapshot of the dataset taken at the end of the last run of the collector
+    :return: dict of news id to list of tweet ids, empty if the collector was never run
+    """
+    snapshot_file = get_snapshot_file(config, feature_type, data_choice)
+
+    if not os.path.exists(snapshot_file):
+        return dict()
+
+    with open(snapshot_file) as file:
+        return json.load(file)
+
+
+def save_dataset_snapshot(config, feature_type, data_choice, snapshot):
+    """
+    :param snapshot: dict of news id to list of the processed tweet ids
+    """
+    snapshot_file = get_snapshot_file(config, feature_type, data_choice)
+    create_dir(os.path.dirname(snapshot_file))
+
+    # Write to a temporary file first so that an interrupted run does not leave a corrupt snapshot
+    with open(snapshot_file + ".tmp", "w") as file:
+        json.dump(snapshot, file)
+    os.replace(snapshot_file + ".tmp", snapshot_file)
+
+
+def get_news_delta(news_list, snapshot):
+    """
+    Diffs the news list against the snapshot of the last run
+    :return: News items not in the snapshot and news items of the snapshot with their tweet ids reduced to the ones
+    added since the snapshot
+    """
+    delta_news_list = []
+
+    for news in news_list:
+        if news.news_id in snapshot:
+            processed_tweet_ids = set(snapshot[news.news_id])
+            news.tweet_ids = [tweet_id for tweet_id in news.tweet_ids if tweet_id not in processed_tweet_ids]
+            news.is_new = False
+
+            if not news.tweet_ids:
+                continue
+
+        delta_news_list.append(news)
+
+    return delta_news_list
+
 
 def create_dir(dir_name):
     if not os.path.exists(dir_name):
@@ -0,0 +1,105 @@
+"""
+Entity Extractor - single pass gazetteer matching shared by the fact checkers
+Tokenizes the text once and walks a token trie built from a loadable
+gazetteer (gazetteer.tsv: name / type / canonical), taking the longest known
+name at each position (case-insensitive, acronyms only in capitals).
+Capitalized word spans that are not in the gazetteer are returned as
+'unknown' entities.
+"""
+
+import csv
+import os
+import re
+from functools import lru_cache
+
+GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.tsv')
+
+TOKEN_PATTERN = re.compile(r"\w+(?:[.'’]\w+)*")
+
+MAX_SPAN_WORDS = 3
+
+_END = None  # trie key holding the (canonical, type) of a complete name
+
+
+def tokenize(text):
+    """(token, lowercase key, starts a new phrase) for every word, in one regex pass"""
+    tokens = []
+    last_end = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        # Punctuation between two words ends capitalized spans ("Paris, Texas")
+        breaks = bool(text[last_end:match.start()].strip())
+        tokens.append((token, token.lower(), breaks))
+        last_end = match.end()
+    return tokens
+
+
+class EntityExtractor:
+    def __init__(self, entries):
+        """entries: iterable of (name, type, canonical)"""
+        self.trie = {}
+        self.size = 0
+        for name, entity_type, canonical in entries:
+            node = self.trie
+            for token, key, _ in tokenize(name):
+                # Acronyms only match in capitals ("WHO" is not "who")
+                node = node.setdefault(token if token.isupper() and len(token) > 1 else key, {})
+            node[_END] = (canonical or name, entity_type)
+            self.size += 1
+
+    @classmethod
+    def load(cls, path=GAZETTEER_FILE):
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = csv.DictReader(f, delimiter='\t')
+            return cls((row['name'], row['type'], row.get('canonical')) for row in rows)
+
+    def match(self, tokens, start):
+        """(canonical, type) and end of the longest gazetteer name starting at tokens[start], else (None, start)"""
+        node = self.trie
+        match, match_end = None, start
+        for j in range(start, len(tokens)):
+            if j > start and tokens[j][2]:
+                break
+            node = node.get(tokens[j][1]) or node.get(tokens[j][0])
+            if node is None:
+                break
+            if _END in node:
+                match, match_end = node[_END], j + 1
+        return match, match_end
+
+    def extract(self, text, fallback=True):
+        """
+        [(name, type)] in text order, without duplicates
+        Known names come back canonical (type from the gazetteer), other
+        capitalized spans of up to MAX_SPAN_WORDS words as 'unknown'
+        """
+        tokens = tokenize(text)
+        entities = {}
+        i = 0
+        while i < len(tokens):
+            match, match_end = self.match(tokens, i)
+            if match:
+                entities.setdefault(match[0], match[1])
+                i = match_end
+                continue
+
+            token = tokens[i][0]
+            if fallback and len(token) > 1 and token[0].isupper():
+                span_end = i + 1
+                # A known name ends the span ("Senator Bernie Sanders"), it is matched on the next step
+                while (span_end < len(tokens) and span_end - i < MAX_SPAN_WORDS and not tokens[span_end][2]
+                       and tokens[span_end][0][0].isupper() and len(tokens[span_end][0]) > 1
+                       and not self.match(tokens, span_end)[0]):
+                    span_end += 1
+                entities.setdefault(' '.join(t[0] for t in tokens[i:span_end]), 'unknown')
+                i = span_end
+                continue
+            i += 1
+
+        return list(entities.items())
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_FILE):
+    """Shared extractor per gazetteer file (built once per process)"""
+    return EntityExtractor.load(path)
@@ -1,152 +1,181 @@
-import pandas as pd
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-# Đọc dữ liệu
-print("Đang đọc dữ liệu...")
-politifact_fake = pd.read_csv('dataset/politifact_fake.csv')
-politifact_real = pd.read_csv('dataset/politifact_real.csv')
-gossipcop_fake = pd.read_csv('dataset/gossipcop_fake.csv')
-gossipcop_real = pd.read_csv('dataset/gossipcop_real.csv')
-
-print("\n" + "="*60)
-print("TỔNG QUAN DATASET")
-print("="*60)
-
-print(f"\nPolitiFact:")
-print(f"  - Tin giả: {len(politifact_fake)} bài")
-print(f"  - Tin thật: {len(politifact_real)} bài")
-print(f"  - Tổng: {len(politifact_fake) + len(politifact_real)} bài")
-
-print(f"\nGossipCop:")
-print(f"  - Tin giả: {len(gossipcop_fake)} bài")
-print(f"  - Tin thật: {len(gossipcop_real)} bài")
-print(f"  - Tổng: {len(gossipcop_fake) + len(gossipcop_real)} bài")
-
-print(f"\nTỔNG CỘNG: {len(politifact_fake) + len(politifact_real) + len(gossipcop_fake) + len(gossipcop_real)} bài viết")
-
-print("\n" + "="*60)
-print("CẤU TRÚC DỮ LIỆU - POLITIFACT FAKE")
-print("="*60)
-print("\nCác cột có trong dataset:")
-print(politifact_fake.columns.tolist())
-print("\nMẫu dữ liệu (5 dòng đầu):")
-print(politifact_fake.head())
-print("\nThông tin chi tiết:")
-print(politifact_fake.info())
-print("\nKiểm tra giá trị null:")
-print(politifact_fake.isnull().sum())
-
-print("\n" + "="*60)
-print("CẤU TRÚC DỮ LIỆU - POLITIFACT REAL")
-print("="*60)
-print(politifact_real.head())
-
-# Lưu thống kê
-with open('dataset_summary.txt', 'w', encoding='utf-8') as f:
-    f.write("THỐNG KÊ DATASET FAKENEWSNET\n")
-    f.write("="*60 + "\n\n")
-    f.write(f"PolitiFact Fake: {len(politifact_fake)} bài\n")
-    f.write(f"PolitiFact Real: {len(politifact_real)} bài\n")
-    f.write(f"GossipCop Fake: {len(gossipcop_fake)} bài\n")
-    f.write(f"GossipCop Real: {len(gossipcop_real)} bài\n")
-    f.write(f"\nCác cột: {politifact_fake.columns.tolist()}\n")
-
-print("\nĐã lưu thống kê vào file 'dataset_summary.txt'")
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-import numpy as np
+from sklearn.metrics import accuracy_score
+from feature_cache import build_cv_folds, load_features, DEFAULT_VECTORIZER_PARAMS
+
+N_FOLDS = 5
+MODEL_NAMES = ['Naive Bayes', 'Logistic Regression', 'Random Forest']
+
+
+def summarize_dataset():
+    # Đọc dữ liệu
+    print("Đang đọc dữ liệu...")
+    politifact_fake = pd.read_csv('dataset/politifact_fake.csv')
+    politifact_real = pd.read_csv('dataset/politifact_real.csv')
+    gossipcop_fake = pd.read_csv('dataset/gossipcop_fake.csv')
+    gossipcop_real = pd.read_csv('dataset/gossipcop_real.csv')
+
+    print("\n" + "="*60)
+    print("TỔNG QUAN DATASET")
+    print("="*60)
+
+    print(f"\nPolitiFact:")
+    print(f"  - Tin giả: {len(politifact_fake)} bài")
+    print(f"  - Tin thật: {len(politifact_real)} bài")
+    print(f"  - Tổng: {len(politifact_fake) + len(politifact_real)} bài")
+
+    print(f"\nGossipCop:")
+    print(f"  - Tin giả: {len(gossipcop_fake)} bài")
+    print(f"  - Tin thật: {len(gossipcop_real)} bài")
+    print(f"  - Tổng: {len(gossipcop_fake) + len(gossipcop_real)} bài")
+
+    print(f"\nTỔNG CỘNG: {len(politifact_fake) + len(politifact_real) + len(gossipcop_fake) + len(gossipcop_real)} bài viết")
+
+    print("\n" + "="*60)
+    print("CẤU TRÚC DỮ LIỆU - POLITIFACT FAKE")
+    print("="*60)
+    print("\nCác cột có trong dataset:")
+    print(politifact_fake.columns.tolist())
+    print("\nMẫu dữ liệu (5 dòng đầu):")
+    print(politifact_fake.head())
+    print("\nThông tin chi tiết:")
+    print(politifact_fake.info())
+    print("\nKiểm tra giá trị null:")
+    print(politifact_fake.isnull().sum())
+
+    print("\n" + "="*60)
+    print("CẤU TRÚC DỮ LIỆU - POLITIFACT REAL")
+    print("="*60)
+    print(politifact_real.head())
+
+    # Lưu thống kê
+    with open('dataset_summary.txt', 'w', encoding='utf-8') as f:
+        f.write("THỐNG KÊ DATASET FAKENEWSNET\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"PolitiFact Fake: {len(politifact_fake)} bài\n")
+        f.write(f"PolitiFact Real: {len(politifact_real)} bài\n")
+        f.write(f"GossipCop Fake: {len(gossipcop_fake)} bài\n")
+        f.write(f"GossipCop Real: {len(gossipcop_real)} bài\n")
+        f.write(f"\nCác cột: {politifact_fake.columns.tolist()}\n")
+
+    print("\nĐã lưu thống kê vào file 'dataset_summary.txt'")
+
+
+def build_model(name):
+    # n_jobs=1: parallelism comes from the process pool (one model x fold per core)
+    models = {
+        'Naive Bayes': lambda: MultinomialNB(),
+        'Logistic Regression': lambda: LogisticRegression(max_iter=1000),
+        'Random Forest': lambda: RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1)
+    }
+    return models[name]()
+
+
+def evaluate_fold(name, fold_key):
+    """Train + test one model on one cached CV fold (runs in a worker process)"""
+    _, X_train_vec, X_test_vec, y_train, y_test = load_features(fold_key)
+
+    start = time.perf_counter()
+    model = build_model(name)
+    model.fit(X_train_vec, y_train)
+    acc = accuracy_score(y_test, model.predict(X_test_vec))
+    return name, acc, time.perf_counter() - start
 
-print("Đang load dữ liệu...")
 
-# Đọc dữ liệu
-politifact_fake = pd.read_csv('dataset/politifact_fake.csv')
-politifact_real = pd.read_csv('dataset/politifact_real.csv')
+def compare_models():
+    print("Đang load dữ liệu...")
 
-# Thêm label (0 = fake, 1 = real)
-politifact_fake['label'] = 0
-politifact_real['label'] = 1
+    # Đọc dữ liệu
+    politifact_fake = pd.read_csv('dataset/politifact_fake.csv')
+    politifact_real = pd.read_csv('dataset/politifact_real.csv')
 
-# Gộp dữ liệu
-data = pd.concat([politifact_fake, politifact_real], ignore_index=True)
+    # Thêm label (0 = fake, 1 = real)
+    politifact_fake['label'] = 0
+    politifact_real['label'] = 1
 
-# Kiểm tra cột text (thay 'title' hoặc 'content' tùy dataset)
-print("\nCác cột có trong dataset:")
-print(data.columns.tolist())
+    # Gộp dữ liệu
+    data = pd.concat([politifact_fake, politifact_real], ignore_index=True)
 
-# Giả sử có cột 'title' hoặc 'text', bạn điều chỉnh tên cột phù hợp
-text_column = 'title'  # THAY ĐỔI NẾU CẦN
+    # Kiểm tra cột text (thay 'title' hoặc 'content' tùy dataset)
+    print("\nCác cột có trong dataset:")
+    print(data.columns.tolist())
 
-# Loại bỏ dòng null
-data = data.dropna(subset=[text_column])
+    # Giả sử có cột 'title' hoặc 'text', bạn điều chỉnh tên cột phù hợp
+    text_column = 'title'  # THAY ĐỔI NẾU CẦN
 
-print(f"\nTổng số mẫu: {len(data)}")
-print(f"Fake news: {len(data[data['label']==0])}")
-print(f"Real news: {len(data[data['label']==1])}")
+    # Loại bỏ dòng null
+    data = data.dropna(subset=[text_column])
 
-# Chia train/test
-X = data[text_column]
-y = data['label']
+    print(f"\nTổng số mẫu: {len(data)}")
+    print(f"Fake news: {len(data[data['label']==0])}")
+    print(f"Real news: {len(data[data['label']==1])}")
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+    X = data[text_column]
+    y = data['label']
 
-print(f"\nTrain set: {len(X_train)}")
-print(f"Test set: {len(X_test)}")
+    total_start = time.perf_counter()
 
-# Vectorization
-print("\nĐang vector hóa text...")
-vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
-X_train_vec = vectorizer.fit_transform(X_train)
-X_test_vec = vectorizer.transform(X_test)
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Vectorize each fold once (cache trong feature_cache/), shared by all models
+        print(f"\nĐang vector hóa text ({N_FOLDS} folds)...")
+        fold_keys = build_cv_folds(X, y, DEFAULT_VECTORIZER_PARAMS, n_splits=N_FOLDS,
+                                   random_state=42, executor=executor)
 
-# Train models
-print("\n" + "="*60)
-print("TRAINING MODELS")
-print("="*60)
+        # Train models
+        print("\n" + "="*60)
+        print(f"TRAINING MODELS ({N_FOLDS}-FOLD CV, {workers} processes)")
+        print("="*60)
 
-models = {
-    'Naive Bayes': MultinomialNB(),
-    'Logistic Regression': LogisticRegression(max_iter=1000),
-    'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42)
-}
+        futures = [executor.submit(evaluate_fold, name, key) for name in MODEL_NAMES for key in fold_keys]
 
-results = {}
+        scores = {name: [] for name in MODEL_NAMES}
+        fit_times = {name: [] for name in MODEL_NAMES}
+        for future in futures:
+            name, acc, seconds = future.result()
+            scores[name].append(acc)
+            fit_times[name].append(seconds)
 
-for name, model in models.items():
-    print(f"\nTraining {name}...")
-    model.fit(X_train_vec, y_train)
-    y_pred = model.predict(X_test_vec)
-    acc = accuracy_score(y_test, y_pred)
-    results[name] = acc
-    
-    print(f"\n{name} Results:")
-    print(f"Accuracy: {acc:.4f}")
-    print("\nClassification Report:")
-    print(classification_report(y_test, y_pred, target_names=['Fake', 'Real']))
-    print("\nConfusion Matrix:")
-    print(confusion_matrix(y_test, y_pred))
-
-# Kết quả tổng hợp
-print("\n" + "="*60)
-print("KẾT QUẢ TỔNG HỢP")
-print("="*60)
-for name, acc in results.items():
-    print(f"{name}: {acc:.4f}")
-
-best_model = max(results, key=results.get)
-print(f"\nModel tốt nhất: {best_model} với accuracy {results[best_model]:.4f}")
-
-# Lưu kết quả
-with open('model_results.txt', 'w') as f:
-    f.write("KẾT QUẢ PHÂN LOẠI FAKE NEWS\n")
-    f.write("="*60 + "\n\n")
-    for name, acc in results.items():
-        f.write(f"{name}: {acc:.4f}\n")
-    f.write(f"\nBest Model: {best_model}\n")
-
-print("\n✅ Đã lưu kết quả vào 'model_results.txt'")
\ No newline at end of file
+    total_time = time.perf_counter() - total_start
+
+    results = {}
+    for name in MODEL_NAMES:
+        results[name] = {
+            'mean': float(np.mean(scores[name])),
+            'std': float(np.std(scores[name])),
+            'time': float(np.sum(fit_times[name]))
+        }
+
+    # Kết quả tổng hợp
+    print("\n" + "="*60)
+    print("KẾT QUẢ TỔNG HỢP")
+    print("="*60)
+    for name, r in results.items():
+        print(f"{name}: {r['mean']:.4f} ± {r['std']:.4f} (train+test {r['time']:.2f}s)")
+    print(f"\nTổng thời gian: {total_time:.2f}s")
+
+    best_model = max(results, key=lambda name: results[name]['mean'])
+    print(f"\nModel tốt nhất: {best_model} với accuracy {results[best_model]['mean']:.4f}")
+
+    # Lưu kết quả
+    with open('model_results.txt', 'w') as f:
+        f.write("KẾT QUẢ PHÂN LOẠI FAKE NEWS\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"{N_FOLDS}-fold CV accuracy (mean ± std), train+test time summed over folds\n\n")
+        for name, r in results.items():
+            f.write(f"{name}: {r['mean']:.4f} ± {r['std']:.4f} ({r['time']:.2f}s)\n")
+        f.write(f"\nBest Model: {best_model}\n")
+
+    print("\n✅ Đã lưu kết quả vào 'model_results.txt'")
+
+
+if __name__ == "__main__":
+    summarize_dataset()
+    compare_models()
@@ -0,0 +1,109 @@
+"""
+Fact Rules - data driven basic fact checks
+Rules are loaded from a JSON table (see basic_facts.json) and all their
+keywords are compiled into one Aho-Corasick automaton, so a text is scanned
+once no matter how many rules there are
+"""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+
+BASIC_FACTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'basic_facts.json')
+
+VERIFICATION_FIELDS = ['claim', 'status', 'confidence', 'source', 'details']
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(pattern_id)
+
+        # Breadth first: fail link = longest proper suffix that is also a trie path
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find_all(self, text):
+        """Set of pattern ids occurring anywhere in text"""
+        found = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        root = goto[0]
+        state = 0
+        for char in text:
+            if not state:
+                # Most characters start no keyword: one dict lookup and move on
+                state = root.get(char, 0)
+            else:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class FactRuleEngine:
+    def __init__(self, rules):
+        self.rules = rules
+        keywords = sorted({kw.lower() for rule in rules for group in rule['keywords'] + [rule.get('negations', [])]
+                           for kw in group})
+        self.matcher = AhoCorasick(keywords)
+        keyword_ids = {kw: i for i, kw in enumerate(keywords)}
+
+        # Rules as keyword id sets; a rule is only evaluated when a keyword of its first group is present
+        self.compiled = []
+        self.triggers = {}
+        for index, rule in enumerate(rules):
+            groups = [frozenset(keyword_ids[kw.lower()] for kw in group) for group in rule['keywords']]
+            negations = frozenset(keyword_ids[kw.lower()] for kw in rule.get('negations', []))
+            self.compiled.append((groups, negations))
+            for keyword_id in groups[0]:
+                self.triggers.setdefault(keyword_id, []).append(index)
+
+    @classmethod
+    def load(cls, path=BASIC_FACTS_FILE):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['rules'])
+
+    def match(self, text_lower):
+        """Verification dicts of all rules matching the (lowercased) text, in rule order"""
+        found = self.matcher.find_all(text_lower)
+
+        candidates = sorted({index for keyword_id in found for index in self.triggers.get(keyword_id, ())})
+        verifications = []
+        for index in candidates:
+            groups, negations = self.compiled[index]
+            if all(group & found for group in groups) and not negations & found:
+                rule = self.rules[index]
+                verifications.append({field: rule[field] for field in VERIFICATION_FIELDS})
+        return verifications
+
+
+@lru_cache(maxsize=None)
+def load_fact_rules(path=BASIC_FACTS_FILE):
+    """Shared engine per rules file (compiled once per process)"""
+    return FactRuleEngine.load(path)
@@ -0,0 +1,145 @@
+"""
+Feature Cache - TF-IDF features stored on disk
+Saves the fitted vectorizer and the train/test sparse matrices so repeated
+experiments on the same data skip text processing
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+CACHE_DIR = 'feature_cache'
+
+# Vectorizer settings shared by the training scripts
+DEFAULT_VECTORIZER_PARAMS = {'max_features': 5000, 'ngram_range': (1, 2)}
+
+
+def cache_key(texts, labels, **params):
+    """Hash of the input data and every parameter that changes the features"""
+    digest = hashlib.sha256()
+    for text, label in zip(texts, labels):
+        digest.update(str(text).encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(str(label).encode('utf-8'))
+        digest.update(b'\x01')
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def load_features(key, cache_dir=CACHE_DIR):
+    """Load cached features, returns None on cache miss"""
+    entry_dir = os.path.join(cache_dir, key)
+    if not os.path.exists(os.path.join(entry_dir, 'vectorizer.pkl')):
+        return None
+
+    with open(os.path.join(entry_dir, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    return (
+        vectorizer,
+        sparse.load_npz(os.path.join(entry_dir, 'X_train.npz')),
+        sparse.load_npz(os.path.join(entry_dir, 'X_test.npz')),
+        np.load(os.path.join(entry_dir, 'y_train.npy')),
+        np.load(os.path.join(entry_dir, 'y_test.npy'))
+    )
+
+
+def save_features(key, vectorizer, X_train_vec, X_test_vec, y_train, y_test, cache_dir=CACHE_DIR):
+    """Save features under the key, the vectorizer is written last and marks the entry complete"""
+    entry_dir = os.path.join(cache_dir, key)
+    os.makedirs(entry_dir, exist_ok=True)
+
+    sparse.save_npz(os.path.join(entry_dir, 'X_train.npz'), X_train_vec.tocsr())
+    sparse.save_npz(os.path.join(entry_dir, 'X_test.npz'), X_test_vec.tocsr())
+    np.save(os.path.join(entry_dir, 'y_train.npy'), np.asarray(y_train))
+    np.save(os.path.join(entry_dir, 'y_test.npy'), np.asarray(y_test))
+
+    with open(os.path.join(entry_dir, 'vectorizer.pkl.tmp'), 'wb') as f:
+        pickle.dump(vectorizer, f)
+    os.replace(os.path.join(entry_dir, 'vectorizer.pkl.tmp'), os.path.join(entry_dir, 'vectorizer.pkl'))
+
+
+def load_or_build_split(texts, labels, vectorizer_params=None, test_size=0.2, random_state=42,
+                        cache_dir=CACHE_DIR):
+    """
+    Stratified train/test split + TF-IDF features, loaded from cache when the
+    same data, split and vectorizer params were used before
+
+    Returns: vectorizer, X_train_vec, X_test_vec, y_train, y_test
+    """
+    vectorizer_params = dict(vectorizer_params or DEFAULT_VECTORIZER_PARAMS)
+    texts = list(texts)
+    labels = np.asarray(labels)
+
+    key = cache_key(texts, labels, split='holdout', test_size=test_size,
+                    random_state=random_state, vectorizer=vectorizer_params)
+
+    cached = load_features(key, cache_dir)
+    if cached is not None:
+        print(f"Loaded cached features: {os.path.join(cache_dir, key)}")
+        return cached
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        texts, labels, test_size=test_size, random_state=random_state, stratify=labels
+    )
+
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    X_train_vec = vectorizer.fit_transform(X_train)
+    X_test_vec = vectorizer.transform(X_test)
+
+    save_features(key, vectorizer, X_train_vec, X_test_vec, y_train, y_test, cache_dir)
+    print(f"Saved features to cache: {os.path.join(cache_dir, key)}")
+
+    return vectorizer, X_train_vec, X_test_vec, y_train, y_test
+
+
+def _build_fold(texts, labels, train_idx, test_idx, vectorizer_params, key, cache_dir):
+    """Fit the vectorizer on one CV fold and store it in the cache (runs in a worker process)"""
+    texts = np.asarray(texts, dtype=object)
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    X_train_vec = vectorizer.fit_transform(texts[train_idx])
+    X_test_vec = vectorizer.transform(texts[test_idx])
+    save_features(key, vectorizer, X_train_vec, X_test_vec, labels[train_idx], labels[test_idx], cache_dir)
+    return key
+
+
+def build_cv_folds(texts, labels, vectorizer_params=None, n_splits=5, random_state=42,
+                   cache_dir=CACHE_DIR, executor=None):
+    """
+    Stratified k-fold TF-IDF features, each fold vectorized once and cached
+    Missing folds are built in parallel when an executor is given
+
+    Returns: list of cache keys, one per fold (read them with load_features)
+    """
+    vectorizer_params = dict(vectorizer_params or DEFAULT_VECTORIZER_PARAMS)
+    texts = list(texts)
+    labels = np.asarray(labels)
+
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    data_key = cache_key(texts, labels, split='kfold', n_splits=n_splits,
+                         random_state=random_state, vectorizer=vectorizer_params)
+
+    keys = []
+    pending = []
+    for fold, (train_idx, test_idx) in enumerate(splitter.split(texts, labels)):
+        key = f"{data_key}-fold{fold}"
+        keys.append(key)
+        if os.path.exists(os.path.join(cache_dir, key, 'vectorizer.pkl')):
+            continue
+
+        job = (texts, labels, train_idx, test_idx, vectorizer_params, key, cache_dir)
+        if executor:
+            pending.append(executor.submit(_build_fold, *job))
+        else:
+            _build_fold(*job)
+
+    for future in pending:
+        future.result()
+
+    return keys
@@ -0,0 +1,283 @@
+"""
+Inference Service - async HTTP API around EnhancedFactChecker
+Concurrent requests are queued and grouped into micro-batches (up to
+--max-batch-size texts, waiting at most --max-wait-ms for the batch to fill),
+so a burst of single-text requests costs one vectorizer/model call and shares
+the fact-check lookups. Batches run one at a time on a worker thread, the
+event loop keeps accepting requests meanwhile.
+
+  POST /analyze   {"text": "..."} or {"texts": [...]}, optional "similar_k"
+  GET  /healthz   process is up, plus batching statistics
+  GET  /readyz    503 until the model and indexes are loaded
+
+    python inference_service.py --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+from aiohttp import web
+
+MAX_TEXTS_PER_REQUEST = 256
+MAX_TEXT_LENGTH = 10000
+MAX_SIMILAR_K = 20
+
+
+def json_default(value):
+    """numpy values in the analysis results (probabilities, scores)"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+json_dumps = partial(json.dumps, default=json_default)
+
+
+class MicroBatcher:
+    """Groups concurrent submit() calls into batches for a blocking batch function"""
+
+    def __init__(self, batch_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.batch_fn = batch_fn  # list of items -> list of results, same order
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = None  # created in start(), on the serving event loop
+        # One thread: the model is not shared between concurrent batches, requests arriving
+        # while a batch runs simply form the next one
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='inference')
+        self.worker = None
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """First waiting item, then whatever arrives until the batch is full or the window closes"""
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Already queued items never wait for the window
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            batch = [(item, future) for item, future in batch if not future.cancelled()]  # client went away
+            if not batch:
+                continue
+
+            outcomes = await loop.run_in_executor(self.executor, self._run_batch, [item for item, _ in batch])
+
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    def _run_batch(self, items):
+        """(result, exception) per item; if the batch fails, items are retried one by one
+        so a bad item only fails its own request"""
+        try:
+            return [(result, None) for result in self.batch_fn(items)]
+        except Exception as batch_error:
+            if len(items) == 1:
+                return [(None, batch_error)]
+
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((self.batch_fn([item])[0], None))
+            except Exception as ex:
+                outcomes.append((None, ex))
+        return outcomes
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'texts': self.items,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0,
+            'largest_batch': self.largest_batch,
+            'queued': self.queue.qsize() if self.queue else 0
+        }
+
+
+def load_checker():
+    """EnhancedFactChecker with the saved model bundle and indexes (slow, runs off the event loop)"""
+    from fact_checker import EnhancedFactChecker
+    from model_bundle import load_model_files
+
+    model, vectorizer = load_model_files()
+    checker = EnhancedFactChecker(model, vectorizer)
+    checker.ml_prediction_batch(["warm up"])  # page in the mapped arrays before reporting ready
+    return checker
+
+
+def analyze_items(checker, items):
+    """Batch function: items are (text, similar_k), one analyze_batch call for all of them"""
+    similar_k = max(k for _, k in items)
+    results = checker.analyze_batch([text for text, _ in items], similar_k=similar_k)
+    for result, (_, k) in zip(results, items):
+        if similar_k:
+            result['similar_stories'] = result['similar_stories'][:k]
+    return results
+
+
+def validate_text(text):
+    """ValueError unless text is fit for a batch (checked before queueing, a bad text fails only its request)"""
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Texts must be non-empty strings")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise ValueError(f"Texts are limited to {MAX_TEXT_LENGTH} characters")
+
+
+def parse_request(body):
+    """(texts, similar_k, single) from an /analyze body, ValueError if it is invalid"""
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+    if 'text' in body:
+        texts, single = [body['text']], True
+    elif 'texts' in body:
+        texts, single = body['texts'], False
+    else:
+        raise ValueError("Missing 'text' or 'texts'")
+
+    if not isinstance(texts, list) or not 0 < len(texts) <= MAX_TEXTS_PER_REQUEST:
+        raise ValueError(f"'texts' must be a list of 1 to {MAX_TEXTS_PER_REQUEST} strings")
+    for text in texts:
+        validate_text(text)
+
+    similar_k = body.get('similar_k', 0)
+    # bool is an int subclass: reject true/false explicitly
+    if isinstance(similar_k, bool) or not isinstance(similar_k, int) or not 0 <= similar_k <= MAX_SIMILAR_K:
+        raise ValueError(f"'similar_k' must be an integer from 0 to {MAX_SIMILAR_K}")
+    return texts, similar_k, single
+
+
+async def analyze(request):
+    if not request.app['ready'].is_set():
+        return web.json_response({'error': "Model is still loading"}, status=503)
+
+    try:
+        texts, similar_k, single = parse_request(await request.json())
+    except ValueError as ex:  # also invalid JSON (json.JSONDecodeError)
+        return web.json_response({'error': str(ex)}, status=400)
+
+    batcher = request.app['batcher']
+    try:
+        results = await asyncio.gather(*(batcher.submit((text, similar_k)) for text in texts))
+    except Exception as ex:
+        print(f"❌ Analysis failed: {ex}")
+        return web.json_response({'error': "Analysis failed"}, status=500)
+
+    body = {'result': results[0]} if single else {'results': results}
+    return web.json_response(body, dumps=json_dumps)
+
+
+async def healthz(request):
+    return web.json_response({
+        'status': 'ok',
+        'uptime_s': round(time.monotonic() - request.app['started'], 1),
+        'batching': request.app['batcher'].stats()
+    })
+
+
+async def readyz(request):
+    app = request.app
+    if app['load_error']:
+        return web.json_response({'ready': False, 'error': app['load_error']}, status=503)
+    if not app['ready'].is_set():
+        return web.json_response({'ready': False}, status=503)
+    checker = app['checker']
+    return web.json_response({
+        'ready': True,
+        'known_story_index': checker.near_duplicates is not None,
+        'similar_story_index': checker.story_index is not None
+    })
+
+
+async def load_model(app):
+    try:
+        app['checker'] = await asyncio.get_running_loop().run_in_executor(None, load_checker)
+    except Exception as ex:
+        app['load_error'] = str(ex)
+        print(f"❌ Could not load the model: {ex}")
+        return
+    app['batcher'].batch_fn = partial(analyze_items, app['checker'])
+    app['ready'].set()
+    print("✅ Model loaded, ready")
+
+
+async def on_startup(app):
+    app['started'] = time.monotonic()
+    app['ready'] = asyncio.Event()
+    app['batcher'].start()
+    # Load in the background: /healthz answers right away, /readyz once loading is done
+    app['loader'] = asyncio.create_task(load_model(app))
+
+
+async def on_cleanup(app):
+    app['loader'].cancel()
+    await app['batcher'].stop()
+
+
+def create_app(max_batch_size=64, max_wait_ms=5.0):
+    app = web.Application()
+    app['batcher'] = MicroBatcher(None, max_batch_size, max_wait_ms)
+    app['checker'] = None
+    app['load_error'] = None
+    app.router.add_post('/analyze', analyze)
+    app.router.add_get('/healthz', healthz)
+    app.router.add_get('/readyz', readyz)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Async HTTP inference service for the fake news detector")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="How long the first request of a batch waits for others to join")
+    args = parser.parse_args()
+
+    web.run_app(create_app(args.max_batch_size, args.max_wait_ms), host=args.host, port=args.port, access_log=None)
@@ -0,0 +1,153 @@
+"""
+Local Knowledge Base - offline entity summaries in SQLite (FTS5)
+Built once from a Wikipedia extract, then queried before the Wikipedia API
+so entity lookups take milliseconds and work without network access.
+
+Build from the Wikipedia abstracts dump
+(https://dumps.wikimedia.org/enwiki/latest/enwiki-latest-abstract.xml.gz)
+or from JSON lines with title / extract / url fields:
+    python knowledge_base.py build --input enwiki-latest-abstract.xml.gz
+    python knowledge_base.py lookup "Barack Obama"
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+KNOWLEDGE_BASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge_base.db')
+
+ABSTRACT_TITLE_PREFIX = 'Wikipedia: '
+
+
+def open_text(path):
+    return gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') else open(path, encoding='utf-8')
+
+
+def iter_abstract_dump(path):
+    """(title, extract, url) from the enwiki abstract XML dump, streamed"""
+    with gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb') as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag != 'doc':
+                continue
+            title = (elem.findtext('title') or '')
+            if title.startswith(ABSTRACT_TITLE_PREFIX):
+                title = title[len(ABSTRACT_TITLE_PREFIX):]
+            yield title, elem.findtext('abstract') or '', elem.findtext('url') or ''
+            elem.clear()
+
+
+def iter_jsonl(path):
+    """(title, extract, url) from JSON lines (e.g. saved Wikipedia REST summaries)"""
+    with open_text(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            url = record.get('url') or record.get('content_urls', {}).get('desktop', {}).get('page', '')
+            yield record.get('title', ''), record.get('extract', ''), url
+
+
+def build_knowledge_base(input_path, output=KNOWLEDGE_BASE_FILE, batch_size=10000):
+    """Build the database next to the target and swap it in, returns the number of entries"""
+    reader = iter_abstract_dump if '.xml' in input_path else iter_jsonl
+    tmp_path = output + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    db = sqlite3.connect(tmp_path)
+    db.execute("CREATE TABLE summaries (title TEXT PRIMARY KEY COLLATE NOCASE, extract TEXT, url TEXT)")
+    db.execute("CREATE VIRTUAL TABLE summaries_fts USING fts5(title, content='summaries', tokenize='unicode61')")
+
+    count = 0
+    batch = []
+    for title, extract, url in reader(input_path):
+        if not title or not extract:
+            continue
+        batch.append((title, extract, url))
+        if len(batch) == batch_size:
+            db.executemany("INSERT OR IGNORE INTO summaries VALUES (?, ?, ?)", batch)
+            count += len(batch)
+            batch = []
+    db.executemany("INSERT OR IGNORE INTO summaries VALUES (?, ?, ?)", batch)
+    count += len(batch)
+
+    db.execute("INSERT INTO summaries_fts(summaries_fts) VALUES ('rebuild')")
+    db.commit()
+    db.close()
+    os.replace(tmp_path, output)
+    return count
+
+
+class KnowledgeBase:
+    """Read only lookups, one connection per thread"""
+
+    def __init__(self, path=KNOWLEDGE_BASE_FILE):
+        self.path = path
+        self.local = threading.local()
+
+    def connection(self):
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = self.local.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return db
+
+    def lookup(self, entity):
+        """
+        Summary of the entity shaped like the Wikipedia REST summary, None if unknown
+        Exact (case insensitive) title first, else the shortest title containing all its words
+        """
+        title = entity.replace('_', ' ').strip()
+        if not title:
+            return None
+
+        db = self.connection()
+        row = db.execute("SELECT title, extract, url FROM summaries WHERE title = ?", (title,)).fetchone()
+        if row is None:
+            phrase = '"' + title.replace('"', '""') + '"'
+            row = db.execute(
+                "SELECT s.title, s.extract, s.url FROM summaries_fts f JOIN summaries s ON s.rowid = f.rowid "
+                "WHERE summaries_fts MATCH ? ORDER BY length(s.title) LIMIT 1", (f"title:{phrase}",)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'title': row[0],
+            'extract': row[1],
+            'content_urls': {'desktop': {'page': row[2]}},
+            'source': 'local'
+        }
+
+
+def open_knowledge_base(path=KNOWLEDGE_BASE_FILE):
+    """KnowledgeBase if the database has been built, else None"""
+    return KnowledgeBase(path) if path and os.path.exists(path) else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local entity knowledge base")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Build the database from a Wikipedia extract")
+    build_parser.add_argument('--input', required=True, help="enwiki abstract XML(.gz) or JSON lines(.gz)")
+    build_parser.add_argument('--output', default=KNOWLEDGE_BASE_FILE)
+
+    lookup_parser = subparsers.add_parser('lookup', help="Look up an entity")
+    lookup_parser.add_argument('entity')
+    lookup_parser.add_argument('--db', default=KNOWLEDGE_BASE_FILE)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.time()
+        count = build_knowledge_base(args.input, args.output)
+        print(f"✅ {count} entries saved to '{args.output}' in {time.time() - start:.1f}s")
+    else:
+        start = time.perf_counter()
+        summary = KnowledgeBase(args.db).lookup(args.entity)
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        print(f"({(time.perf_counter() - start) * 1000:.2f} ms)")
@@ -0,0 +1,123 @@
+"""
+Load Test - throughput and latency of a running inference_service.py
+Dataset titles are sent as single-text /analyze requests by --concurrency
+concurrent clients; the report adds the server's micro-batching statistics
+for the run (from /healthz).
+
+    WIKIPEDIA_OFFLINE=1 python inference_service.py --port 8080
+    python load_test_service.py --url http://localhost:8080 --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from benchmark_inference import load_texts, percentiles
+
+
+async def wait_until_ready(session, url, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(f"{url}/readyz") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientConnectionError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"{url} did not become ready within {timeout}s")
+        await asyncio.sleep(0.5)
+
+
+async def batching_stats(session, url):
+    async with session.get(f"{url}/healthz") as response:
+        return (await response.json())['batching']
+
+
+async def client(session, url, texts, indices, similar_k, latencies):
+    """Sends the requests of a shared index iterator one after another, returns the number of errors"""
+    errors = 0
+    for i in indices:
+        start = time.perf_counter()
+        try:
+            async with session.post(f"{url}/analyze",
+                                    json={'text': texts[i % len(texts)], 'similar_k': similar_k}) as response:
+                await response.read()
+                if response.status != 200:
+                    errors += 1
+                    continue
+        except aiohttp.ClientError:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    return errors
+
+
+async def run_clients(session, url, texts, num_requests, concurrency, similar_k):
+    indices = iter(range(num_requests))  # shared: every request is sent once
+    latencies = []
+    errors = await asyncio.gather(*(client(session, url, texts, indices, similar_k, latencies)
+                                    for _ in range(concurrency)))
+    return latencies, sum(errors)
+
+
+async def run_load_test(url, texts, num_requests, concurrency, similar_k, ready_timeout):
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_until_ready(session, url, ready_timeout)
+        # Warm up connections and the server's caches, not part of the measurement
+        await run_clients(session, url, texts, concurrency, concurrency, similar_k)
+
+        before = await batching_stats(session, url)
+        start = time.perf_counter()
+        latencies, errors = await run_clients(session, url, texts, num_requests, concurrency, similar_k)
+        elapsed = time.perf_counter() - start
+        after = await batching_stats(session, url)
+
+    batches = after['batches'] - before['batches']
+    return {
+        'url': url,
+        'requests': num_requests,
+        'concurrency': concurrency,
+        'similar_k': similar_k,
+        'errors': errors,
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency': percentiles(latencies) if latencies else None,
+        'server_batches': batches,
+        'server_mean_batch_size': round((after['texts'] - before['texts']) / batches, 2) if batches else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the inference service")
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--dataset-dir', default='dataset')
+    parser.add_argument('--n-texts', type=int, default=2000, help="Dataset titles used as inputs")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64],
+                        help="One run per concurrency level")
+    parser.add_argument('--similar-k', type=int, default=0)
+    parser.add_argument('--ready-timeout', type=float, default=120)
+    parser.add_argument('--output', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    texts = load_texts(args.dataset_dir, args.n_texts)
+    results = []
+    for concurrency in args.concurrency:
+        print(f"⏱️ {args.requests} requests, concurrency {concurrency}...")
+        result = asyncio.run(run_load_test(args.url.rstrip('/'), texts, args.requests, concurrency,
+                                           args.similar_k, args.ready_timeout))
+        print(json.dumps(result, indent=2))
+        results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Lookup Cache - thread safe TTL + LRU cache for remote lookups
+Memory tier (OrderedDict LRU) with an optional SQLite disk tier shared
+between processes and restarts. Values must be JSON serializable; None is a
+valid value (negative caching of "not found" answers).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+MISS = object()
+
+
+class LookupCache:
+    def __init__(self, max_entries=10000, ttl=24 * 3600, negative_ttl=3600, disk_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Disk tier is opened on first use, once per process (a connection must not cross a fork)
+        self.disk_path = disk_path
+        self._db = None
+        self._db_pid = None
+
+    def get(self, key, allow_stale=False):
+        """Cached value of key, MISS if absent or expired (allow_stale: expired entries still count)"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            db = self._connection()
+            if (entry is None or entry[0] < now) and db is not None:
+                # Another process may have refreshed it
+                disk_entry = self._disk_get(db, key)
+                if disk_entry is not None and (entry is None or disk_entry[0] > entry[0]):
+                    entry = disk_entry
+                    self._memory_set(key, entry)
+
+            if entry is None or (entry[0] < now and not allow_stale):
+                self.misses += 1
+                return MISS
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Store value; None values expire after negative_ttl unless ttl is given"""
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        entry = (time.time() + ttl, value)
+
+        with self.lock:
+            self._memory_set(key, entry)
+            db = self._connection()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, json.dumps(value), entry[0]))
+                db.commit()
+
+    def clear(self, disk=False):
+        with self.lock:
+            self.entries.clear()
+            db = self._connection() if disk else None
+            if db is not None:
+                db.execute("DELETE FROM cache")
+                db.commit()
+
+    def set_disk_path(self, disk_path):
+        """Switch the disk tier to another SQLite file (None: memory only)"""
+        with self.lock:
+            if self._db is not None and self._db_pid == os.getpid():
+                self._db.close()
+            self.disk_path = disk_path
+            self._db = None
+            self._db_pid = None
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _memory_set(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _connection(self):
+        """SQLite connection of the current process, None without a disk tier (call with the lock held)"""
+        if not self.disk_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _disk_get(self, db, key):
+        row = db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[1], json.loads(row[0])
@@ -0,0 +1,233 @@
+"""
+Model Bundle - single versioned model file set replacing model.pkl + vectorizer.pkl
+Vocabulary, idf weights and coefficients are stored as memory-mappable numpy
+arrays next to a small JSON manifest, so loading takes milliseconds and the
+pages are shared by every process serving the model
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import time
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+BUNDLE_DIR = 'model_bundle'
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+TERMS_FILE = 'terms.npy'
+IDF_FILE = 'idf.npy'
+COEF_FILE = 'coef.npy'
+
+
+def save_bundle(model, vectorizer, path=BUNDLE_DIR, metadata=None):
+    """
+    Save a fitted TfidfVectorizer + binary linear classifier (LogisticRegression,
+    SGDClassifier with log loss) as a bundle directory
+    """
+    params = vectorizer.get_params()
+    if params['analyzer'] != 'word' or params['tokenizer'] or params['preprocessor'] or params['strip_accents']:
+        raise ValueError("Only word analyzers with the default tokenizer/preprocessor can be bundled")
+    if model.coef_.shape[0] != 1:
+        raise ValueError("Only binary linear models can be bundled")
+
+    # Terms sorted so the vectorizer can look them up with a binary search on the mapped array
+    terms = np.array(sorted(vectorizer.vocabulary_))
+    columns = np.array([vectorizer.vocabulary_[term] for term in terms])
+
+    stop_words = vectorizer.get_stop_words()
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'vectorizer': {
+            'lowercase': params['lowercase'],
+            'token_pattern': params['token_pattern'],
+            'ngram_range': list(params['ngram_range']),
+            'stop_words': sorted(stop_words) if stop_words else None,
+            'binary': params['binary'],
+            'sublinear_tf': params['sublinear_tf'],
+            'use_idf': params['use_idf'],
+            'norm': params['norm']
+        },
+        'model': {
+            'type': type(model).__name__,
+            'classes': [int(c) for c in model.classes_],
+            'intercept': float(model.intercept_[0])
+        },
+        'n_terms': len(terms),
+        'metadata': metadata or {}
+    }
+
+    # Write next to the target and swap, readers never see a half written bundle
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    np.save(os.path.join(tmp_path, TERMS_FILE), terms)
+    idf = vectorizer.idf_[columns] if params['use_idf'] else np.ones(len(terms))
+    np.save(os.path.join(tmp_path, IDF_FILE), idf.astype(np.float64))
+    np.save(os.path.join(tmp_path, COEF_FILE), model.coef_[0][columns].astype(np.float64))
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+class BundleVectorizer:
+    """TF-IDF transform equivalent to the bundled TfidfVectorizer"""
+
+    def __init__(self, config, terms, idf):
+        self.config = config
+        self.terms = terms
+        self.idf = idf
+        self.token_pattern = re.compile(config['token_pattern'])
+        self.min_n, self.max_n = config['ngram_range']
+        self.stop_words = frozenset(config['stop_words'] or [])
+
+    def analyze(self, text):
+        """Same token + n-gram sequence as sklearn's word analyzer"""
+        if self.config['lowercase']:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        ngrams = []
+        for n in range(self.min_n, min(self.max_n, len(tokens)) + 1):
+            if n == 1:
+                ngrams.extend(tokens)
+            else:
+                ngrams.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return ngrams
+
+    def lookup(self, ngrams):
+        """Column index of each n-gram, -1 if not in the vocabulary"""
+        if not ngrams:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.array(ngrams)
+        idx = np.searchsorted(self.terms, candidates)
+        idx[idx == len(self.terms)] = 0
+        return np.where(self.terms[idx] == candidates, idx, -1)
+
+    def transform(self, texts):
+        indptr = [0]
+        indices = []
+        values = []
+
+        for text in texts:
+            counts = Counter(self.analyze(text))
+            ngrams = list(counts)
+            cols = self.lookup(ngrams)
+            keep = cols >= 0
+
+            tf = np.array([counts[g] for g in ngrams], dtype=np.float64)[keep]
+            cols = cols[keep]
+            if self.config['binary']:
+                tf = np.ones_like(tf)
+            elif self.config['sublinear_tf']:
+                tf = np.log(tf) + 1
+
+            row = tf * self.idf[cols]
+            if self.config['norm'] == 'l2' and len(row):
+                row = row / np.sqrt(np.dot(row, row))
+            elif self.config['norm'] == 'l1' and len(row):
+                row = row / np.abs(row).sum()
+
+            order = np.argsort(cols)
+            indices.append(cols[order])
+            values.append(row[order])
+            indptr.append(indptr[-1] + len(cols))
+
+        return sparse.csr_matrix(
+            (np.concatenate(values) if values else [], np.concatenate(indices) if indices else [], indptr),
+            shape=(len(indptr) - 1, len(self.terms))
+        )
+
+
+class BundleModel:
+    """Binary linear classifier with the predict / predict_proba API of sklearn"""
+
+    def __init__(self, config, coef):
+        self.coef = coef
+        self.intercept = config['intercept']
+        self.classes_ = np.array(config['classes'])
+
+    def decision_function(self, X):
+        return np.asarray(X @ self.coef).ravel() + self.intercept
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def vocabulary_hash(vectorizer):
+    """
+    Fingerprint of the vectorizer's terms in column order (same for a fitted
+    TfidfVectorizer and its bundle), None if the vectorizer has no vocabulary
+    """
+    if isinstance(vectorizer, BundleVectorizer):
+        terms = vectorizer.terms
+    elif hasattr(vectorizer, 'vocabulary_'):
+        terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    else:
+        return None
+    return hashlib.sha1('\n'.join(map(str, terms)).encode('utf-8')).hexdigest()
+
+
+def load_bundle(path=BUNDLE_DIR):
+    """Load a bundle, returns (model, vectorizer) usable by EnhancedFactChecker"""
+    with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format {manifest['format_version']} (expected {FORMAT_VERSION})")
+
+    terms = np.load(os.path.join(path, TERMS_FILE), mmap_mode='r')
+    idf = np.load(os.path.join(path, IDF_FILE), mmap_mode='r')
+    coef = np.load(os.path.join(path, COEF_FILE), mmap_mode='r')
+
+    model = BundleModel(manifest['model'], coef)
+    vectorizer = BundleVectorizer(manifest['vectorizer'], terms, idf)
+    model.manifest = manifest
+    return model, vectorizer
+
+
+def load_model_files(path=BUNDLE_DIR, model_file='model.pkl', vectorizer_file='vectorizer.pkl'):
+    """Load the bundle, falling back to the legacy model.pkl + vectorizer.pkl"""
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return load_bundle(path)
+
+    with open(model_file, 'rb') as f:
+        model = pickle.load(f)
+    with open(vectorizer_file, 'rb') as f:
+        vectorizer = pickle.load(f)
+    return model, vectorizer
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert model.pkl + vectorizer.pkl to a model bundle")
+    parser.add_argument('--model', default='model.pkl')
+    parser.add_argument('--vectorizer', default='vectorizer.pkl')
+    parser.add_argument('--out', default=BUNDLE_DIR)
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    with open(args.vectorizer, 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    save_bundle(model, vectorizer, args.out, metadata={'converted_from': [args.model, args.vectorizer]})
+    print(f"Bundle saved to '{args.out}'")
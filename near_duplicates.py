@@ -0,0 +1,189 @@
+"""
+Near-Duplicate Index - MinHash / LSH over the labeled dataset titles
+Built at training time next to the model bundle. A query hashes the input
+once and looks up each LSH band with a binary search on memory-mapped
+arrays, so an input that is essentially a known PolitiFact / GossipCop
+story gets its label back in well under a millisecond
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+import zlib
+
+import numpy as np
+
+NEAR_DUPLICATE_DIR = 'near_duplicate_index'
+FORMAT_VERSION = 2  # 2: hash parameters reduced mod a 32-bit prime
+
+NUM_PERM = 128
+BANDS = 16          # 16 bands x 8 rows: pairs above ~0.7 Jaccard become candidates
+SHINGLE_SIZE = 5    # character shingles, robust to small edits and punctuation
+THRESHOLD = 0.8     # estimated Jaccard similarity needed to report a match
+SEED = 42
+
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32: a * x + b < 2**64, no uint64 wrap-around
+_BAND_MULTIPLIER = np.uint64(1099511628211)
+_BAND_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+MANIFEST_FILE = 'manifest.json'
+SIGNATURES_FILE = 'signatures.npy'
+BAND_KEYS_FILE = 'band_keys.npy'
+BAND_ROWS_FILE = 'band_rows.npy'
+RECORDS_FILE = 'records.json'
+
+
+def normalize(text):
+    return ' '.join(re.findall(r'\w+', str(text).lower()))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """crc32 hashes of the character shingles of the normalized text"""
+    text = normalize(text)
+    if len(text) <= size:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = np.random.RandomState(seed)
+        # 1 <= a < p, 0 <= b < p
+        self.a = rng.randint(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        """Minimum of (a * x + b) mod p over the shingles, for every permutation"""
+        if not len(hashes):
+            return np.full(len(self.a), np.iinfo(np.uint32).max, dtype=np.uint32)
+        # x, a, b < p < 2**32, so a * x + b < 2**64 is computed exactly in uint64
+        values = ((hashes % _PRIME)[:, None] * self.a[None, :] + self.b[None, :]) % _PRIME
+        return values.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signatures, bands=BANDS):
+    """
+    One 64-bit key per (signature, band): polynomial hash of the band's rows,
+    salted with the band number so all bands can share one sorted array.
+    uint64 arithmetic wraps around on purpose.
+    """
+    signatures = np.atleast_2d(signatures).astype(np.uint64)
+    rows = signatures.shape[1] // bands
+    with np.errstate(over='ignore'):
+        powers = np.cumprod(np.full(rows, _BAND_MULTIPLIER, dtype=np.uint64))[::-1]
+        keys = (signatures[:, :bands * rows].reshape(len(signatures), bands, rows) * powers).sum(axis=2, dtype=np.uint64)
+        return keys ^ (np.arange(bands, dtype=np.uint64) * _BAND_SALT)
+
+
+def record_field(record, field):
+    value = record.get(field)
+    return '' if value is None or value != value else str(value)  # value != value: NaN from the CSVs
+
+
+def build_near_duplicate_index(records, path=NEAR_DUPLICATE_DIR, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Index labeled records ({'news_id', 'source', 'label', 'title', 'url'}, see
+    news_corpus.iter_csv_records), returns the number of indexed titles
+    """
+    hasher = MinHasher(num_perm)
+    metadata = []
+    signatures = []
+    seen = set()
+    for record in records:
+        key = normalize(record['title'])
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        signatures.append(hasher.signature(shingles(record['title'])))
+        metadata.append({field: record_field(record, field) for field in ('news_id', 'source', 'label', 'title', 'url')})
+
+    signatures = np.array(signatures, dtype=np.uint32).reshape(-1, num_perm)
+    # Flat (key, row) table of every band, sorted by key for binary search
+    keys = band_keys(signatures, bands).ravel()
+    order = np.argsort(keys, kind='stable')
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'num_perm': num_perm,
+        'bands': bands,
+        'shingle_size': SHINGLE_SIZE,
+        'seed': SEED,
+        'size': len(metadata)
+    }
+
+    # Same swap-in as the model bundle, readers never see a half written index
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, SIGNATURES_FILE), signatures)
+    np.save(os.path.join(tmp_path, BAND_KEYS_FILE), keys[order])
+    np.save(os.path.join(tmp_path, BAND_ROWS_FILE), (order // bands).astype(np.int32))
+    with open(os.path.join(tmp_path, RECORDS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False)
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return len(metadata)
+
+
+class NearDuplicateIndex:
+    def __init__(self, manifest, signatures, keys, rows, records):
+        self.manifest = manifest
+        self.signatures = signatures
+        self.keys = keys
+        self.rows = rows
+        self.records = records
+        self.hasher = MinHasher(manifest['num_perm'], manifest['seed'])
+
+    def candidates(self, signature):
+        """Rows sharing at least one LSH band with the signature"""
+        query_keys = band_keys(signature, self.manifest['bands'])[0]
+        lo = np.searchsorted(self.keys, query_keys, side='left')
+        hi = np.searchsorted(self.keys, query_keys, side='right')
+        hit = lo < hi
+        if not hit.any():
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate([self.rows[start:end] for start, end in zip(lo[hit], hi[hit])]))
+
+    def query(self, text, threshold=THRESHOLD):
+        """Best known story with estimated similarity >= threshold, else None"""
+        hashes = shingles(text, self.manifest['shingle_size'])
+        if not len(hashes):
+            return None
+        signature = self.hasher.signature(hashes)
+
+        rows = self.candidates(signature)
+        if not len(rows):
+            return None
+
+        # Fraction of equal MinHash values estimates the Jaccard similarity of the shingle sets
+        similarities = (self.signatures[rows] == signature).mean(axis=1)
+        best = similarities.argmax()
+        if similarities[best] < threshold:
+            return None
+        return dict(self.records[rows[best]], similarity=round(float(similarities[best]), 3))
+
+
+def load_near_duplicate_index(path=NEAR_DUPLICATE_DIR):
+    """Memory-mapped index, None if it has not been built"""
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return None
+
+    with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format {manifest['format_version']} (expected {FORMAT_VERSION})")
+    with open(os.path.join(path, RECORDS_FILE), encoding='utf-8') as f:
+        records = json.load(f)
+
+    # Plain ndarray views of the mapped files (np.memmap adds overhead to every small operation)
+    arrays = [np.load(os.path.join(path, name), mmap_mode='r').view(np.ndarray)
+              for name in (SIGNATURES_FILE, BAND_KEYS_FILE, BAND_ROWS_FILE)]
+    return NearDuplicateIndex(manifest, *arrays, records)
@@ -0,0 +1,142 @@
+"""
+News Corpus Reader
+Streams FakeNewsNet records chunk by chunk so the whole corpus is never held in memory
+"""
+
+import os
+import sys
+import zlib
+
+import pandas as pd
+
+# Collected records are read with the collection code's reader (plain, .gz or .zst, orjson when installed)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'code', 'util'))
+from record_io import find_record, load_record  # noqa: E402
+
+NEWS_SOURCES = ['politifact', 'gossipcop']
+NEWS_LABELS = ['fake', 'real']
+
+# Label encoding used by all models (0 = fake, 1 = real)
+LABEL_IDS = {'fake': 0, 'real': 1}
+
+# Article file written by the collection code (code/news_content_collection.py)
+NEWS_CONTENT_FILE = 'news content.json'
+
+
+def iter_csv_records(dataset_dir='dataset', sources=NEWS_SOURCES, chunksize=1000):
+    """
+    Yield news records from the dataset CSVs:
+    {'news_id', 'source', 'label', 'title', 'url'}
+
+    Files are read in chunks and interleaved chunk by chunk, so consecutive
+    records mix sources and labels (needed for incremental training).
+    """
+    readers = []
+    for source in sources:
+        for label in NEWS_LABELS:
+            path = os.path.join(dataset_dir, f'{source}_{label}.csv')
+            if not os.path.exists(path):
+                print(f"⚠️ Missing dataset file: {path}")
+                continue
+            chunks = pd.read_csv(path, usecols=['id', 'news_url', 'title'], chunksize=chunksize)
+            readers.append((source, label, chunks))
+
+    while readers:
+        for reader in list(readers):
+            source, label, chunks = reader
+            chunk = next(chunks, None)
+            if chunk is None:
+                readers.remove(reader)
+                continue
+
+            chunk = chunk.dropna(subset=['title'])
+            for news_id, url, title in zip(chunk['id'], chunk['news_url'], chunk['title']):
+                yield {
+                    'news_id': news_id,
+                    'source': source,
+                    'label': label,
+                    'title': title,
+                    'url': url
+                }
+
+
+def find_news_content(news_dir):
+    """Path of the news content file in a news folder, None if the article was not collected"""
+    return find_record(os.path.join(news_dir, NEWS_CONTENT_FILE))
+
+
+def iter_label_dir(dump_location, source, label):
+    """Yield the collected articles of one {source}/{label} folder, one file read at a time"""
+    label_dir = os.path.join(dump_location, source, label)
+    if not os.path.isdir(label_dir):
+        return
+
+    with os.scandir(label_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            path = find_news_content(entry.path)
+            if path is None:
+                continue
+
+            try:
+                article = load_record(path)
+            except (OSError, ValueError):
+                print(f"⚠️ Could not read {path}")
+                continue
+
+            yield {
+                'news_id': entry.name,
+                'source': source,
+                'label': label,
+                'title': article.get('title') or '',
+                'text': article.get('text') or '',
+                'url': article.get('url') or ''
+            }
+
+
+def interleave(iterators):
+    """Round-robin over several iterators until all are exhausted"""
+    iterators = list(iterators)
+    while iterators:
+        for iterator in list(iterators):
+            item = next(iterator, None)
+            if item is None:
+                iterators.remove(iterator)
+            else:
+                yield item
+
+
+def iter_dump_records(dump_location, sources=NEWS_SOURCES, labels=NEWS_LABELS):
+    """
+    Yield collected articles from {dump_location}/{source}/{label}/{news_id}/news content.json:
+    {'news_id', 'source', 'label', 'title', 'text', 'url'}
+
+    The label comes from the folder the article is in. Folders are read
+    round-robin, so consecutive records mix sources and labels.
+    """
+    return interleave(iter_label_dir(dump_location, source, label) for source in sources for label in labels)
+
+
+def iter_batches(records, batch_size=1000, max_chars=None):
+    """
+    Group a record stream into lists of at most batch_size records
+    max_chars: also close a batch once its title + text reach this many
+    characters, bounding memory when documents are full articles
+    """
+    batch = []
+    chars = 0
+    for record in records:
+        batch.append(record)
+        chars += len(record.get('title') or '') + len(record.get('text') or '')
+        if len(batch) == batch_size or (max_chars and chars >= max_chars):
+            yield batch
+            batch = []
+            chars = 0
+    if batch:
+        yield batch
+
+
+def is_holdout(news_id, holdout_fraction=0.2):
+    """Deterministic train/test assignment by hashing the news id (no index kept in memory)"""
+    return zlib.crc32(str(news_id).encode('utf-8')) % 10000 < holdout_fraction * 10000
@@ -0,0 +1,228 @@
+"""
+Propagation Features - per news_id social context table
+Turns the collected tweets, retweets and sharer profiles into numeric
+features with one vectorized (pandas) pass over the flattened records.
+The table is updated incrementally: only news folders that changed since
+the last build are read again.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from news_corpus import NEWS_SOURCES, NEWS_LABELS, find_news_content, load_record
+
+FEATURES_FILE = 'propagation_features.csv'
+TWITTER_TIME_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+FEATURE_COLUMNS = [
+    'tweet_count', 'retweet_count', 'unique_sharers',
+    'cascade_size_max', 'cascade_size_mean', 'cascade_depth_max',
+    'time_to_first_share_hours', 'share_span_hours',
+    'sharer_followers_mean', 'sharer_followers_median', 'sharer_followers_p90', 'sharer_followers_max'
+]
+
+
+def news_dir_signature(news_dir):
+    """Latest modification time of the news folder contents (folders change when files are added)"""
+    paths = [news_dir, os.path.join(news_dir, 'tweets'), os.path.join(news_dir, 'retweets')]
+    content = find_news_content(news_dir)
+    if content:
+        paths.append(content)
+    return max(os.stat(path).st_mtime_ns for path in paths if os.path.exists(path))
+
+
+def iter_news_dirs(dump_location, sources=NEWS_SOURCES):
+    for source in sources:
+        for label in NEWS_LABELS:
+            label_dir = os.path.join(dump_location, source, label)
+            if not os.path.isdir(label_dir):
+                continue
+            with os.scandir(label_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        yield entry.name, source, label, entry.path
+
+
+def iter_json_files(folder):
+    if not os.path.isdir(folder):
+        return
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and '.json' in entry.name:
+                try:
+                    yield load_record(entry.path)
+                except (OSError, ValueError):
+                    continue
+
+
+def read_news_rows(news_id, news_dir, tweet_rows, retweet_rows):
+    """Flatten one news folder into tweet / retweet rows (no per-news computation here)"""
+    for tweet in iter_json_files(os.path.join(news_dir, 'tweets')):
+        user = tweet.get('user') or {}
+        tweet_rows.append((news_id, tweet['id'], tweet.get('created_at'), user.get('id'),
+                           user.get('followers_count'), tweet.get('in_reply_to_status_id')))
+
+    for retweet_file in iter_json_files(os.path.join(news_dir, 'retweets')):
+        for retweet in retweet_file.get('retweets') or []:
+            user = retweet.get('user') or {}
+            root = (retweet.get('retweeted_status') or {}).get('id')
+            retweet_rows.append((news_id, root, retweet.get('created_at'), user.get('id'),
+                                 user.get('followers_count')))
+
+
+def parse_tweet_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def tweet_ids(values):
+    """Nullable Int64 ids, exact (pd.to_numeric would go through float64 when values are missing)"""
+    return pd.array([parse_tweet_id(value) for value in values], dtype='Int64')
+
+
+def reply_depths(tweets):
+    """Depth of each tweet in reply chains among the tweets of the same news item"""
+    depth = pd.Series(0, index=tweets.index)
+    parent = tweets[['news_id', 'tweet_id']].reset_index().rename(columns={'index': 'parent_row',
+                                                                          'tweet_id': 'reply_to'})
+    replies = tweets[['news_id', 'reply_to']].dropna(subset=['reply_to'])
+    links = replies.reset_index().merge(parent, on=['news_id', 'reply_to'])
+    if links.empty:
+        return depth
+
+    child_rows = links['index'].to_numpy()
+    parent_rows = links['parent_row'].to_numpy()
+    for _ in range(50):  # bounded: reply chains are short
+        updated = depth.copy()
+        updated.iloc[child_rows] = np.maximum(depth.iloc[child_rows].to_numpy(), depth.iloc[parent_rows].to_numpy() + 1)
+        if updated.equals(depth):
+            break
+        depth = updated
+    return depth
+
+
+def compute_features(tweet_rows, retweet_rows, publish_dates):
+    """Vectorized groupby aggregations over all flattened rows"""
+    tweets = pd.DataFrame(tweet_rows, columns=['news_id', 'tweet_id', 'created_at', 'user_id', 'followers',
+                                               'reply_to'], dtype=object)
+    retweets = pd.DataFrame(retweet_rows, columns=['news_id', 'root_id', 'created_at', 'user_id', 'followers'],
+                            dtype=object)
+
+    # Ids as nullable integers: a column of only None (no replies at all) must still merge with the ids.
+    # The frames are built as object so a missing reply_to does not turn the column into float64 first
+    for frame, id_columns in ((tweets, ['tweet_id', 'reply_to']), (retweets, ['root_id'])):
+        for column in id_columns:
+            frame[column] = tweet_ids(frame[column])
+
+    for frame in (tweets, retweets):
+        frame['time'] = pd.to_datetime(frame['created_at'], format=TWITTER_TIME_FORMAT, errors='coerce', utc=True)
+        frame['followers'] = pd.to_numeric(frame['followers'], errors='coerce')
+
+    features = pd.DataFrame(index=pd.Index(sorted(publish_dates), name='news_id'))
+    features['tweet_count'] = tweets.groupby('news_id').size()
+    features['retweet_count'] = retweets.groupby('news_id').size()
+
+    # Cascades: each tweet + its retweets
+    sizes = retweets.groupby(['news_id', 'root_id']).size().rename('retweets').reset_index()
+    cascades = tweets[['news_id', 'tweet_id']].merge(sizes, left_on=['news_id', 'tweet_id'],
+                                                     right_on=['news_id', 'root_id'], how='left')
+    cascades['size'] = 1 + cascades['retweets'].fillna(0)
+    cascades['depth'] = reply_depths(tweets).to_numpy() + (cascades['retweets'].fillna(0) > 0)
+    grouped = cascades.groupby('news_id')
+    features['cascade_size_max'] = grouped['size'].max()
+    features['cascade_size_mean'] = grouped['size'].mean()
+    features['cascade_depth_max'] = grouped['depth'].max()
+
+    # Timing, relative to the article publish date when it is known
+    shares = pd.concat([tweets[['news_id', 'time', 'user_id', 'followers']],
+                        retweets[['news_id', 'time', 'user_id', 'followers']]], ignore_index=True)
+    times = shares.groupby('news_id')['time']
+    first_share = times.min().reindex(features.index)
+    last_share = times.max().reindex(features.index)
+    published = pd.to_datetime(pd.Series(publish_dates, dtype='float64'), unit='s', utc=True).reindex(features.index)
+    features['time_to_first_share_hours'] = (first_share - published).dt.total_seconds() / 3600
+    features['share_span_hours'] = (last_share - first_share).dt.total_seconds() / 3600
+
+    # Follower counts of the distinct sharers
+    sharers = shares.dropna(subset=['user_id']).drop_duplicates(['news_id', 'user_id']).groupby('news_id')['followers']
+    features['unique_sharers'] = sharers.size()
+    features['sharer_followers_mean'] = sharers.mean()
+    features['sharer_followers_median'] = sharers.median()
+    features['sharer_followers_p90'] = sharers.quantile(0.9)
+    features['sharer_followers_max'] = sharers.max()
+
+    count_columns = ['tweet_count', 'retweet_count', 'unique_sharers', 'cascade_size_max', 'cascade_depth_max']
+    features[count_columns] = features[count_columns].fillna(0)
+    return features.reset_index()
+
+
+def build_feature_table(dump_location, output=FEATURES_FILE, sources=NEWS_SOURCES):
+    """Create or incrementally update the feature table, returns it as a DataFrame"""
+    previous = pd.read_csv(output, dtype={'news_id': str}) if os.path.exists(output) else None
+    known = {} if previous is None else dict(zip(previous['news_id'], previous['signature']))
+
+    tweet_rows, retweet_rows = [], []
+    publish_dates = {}
+    meta = {}
+    for news_id, source, label, news_dir in iter_news_dirs(dump_location, sources):
+        signature = news_dir_signature(news_dir)
+        if known.get(news_id) == signature:
+            continue
+
+        content = find_news_content(news_dir)
+        article = load_record(content) if content else {}
+        publish_dates[news_id] = article.get('publish_date')
+        meta[news_id] = (source, label, signature)
+        read_news_rows(news_id, news_dir, tweet_rows, retweet_rows)
+
+    print(f"Updating {len(meta)} news items ({len(known)} already in the table)")
+    if not meta:
+        return previous
+
+    updated = compute_features(tweet_rows, retweet_rows, publish_dates)
+    updated['source'] = updated['news_id'].map(lambda news_id: meta[news_id][0])
+    updated['label'] = updated['news_id'].map(lambda news_id: meta[news_id][1])
+    updated['signature'] = updated['news_id'].map(lambda news_id: meta[news_id][2])
+    updated = updated[['news_id', 'source', 'label'] + FEATURE_COLUMNS + ['signature']]
+
+    if previous is not None:
+        updated = pd.concat([previous[~previous['news_id'].isin(updated['news_id'])], updated], ignore_index=True)
+
+    updated.to_csv(output + '.tmp', index=False)
+    os.replace(output + '.tmp', output)
+    return updated
+
+
+def join_features(news_ids, table, log_scale=True):
+    """
+    Feature rows aligned with news_ids (zeros for news without social data),
+    ready to hstack with the TF-IDF matrix of the same news items
+    """
+    values = table.set_index('news_id')[FEATURE_COLUMNS].reindex([str(n) for n in news_ids])
+    values = values.fillna(0).to_numpy(dtype=np.float64)
+    if log_scale:
+        values = np.sign(values) * np.log1p(np.abs(values))
+    return values
+
+
+def hstack_with_text(X_text, news_ids, table):
+    """TF-IDF features + propagation features in one sparse matrix"""
+    return sparse.hstack([X_text, sparse.csr_matrix(join_features(news_ids, table))], format='csr')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the propagation feature table from collected data")
+    parser.add_argument('--dump-location', required=True, help="code/config.json dump_location")
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, choices=NEWS_SOURCES)
+    parser.add_argument('--output', default=FEATURES_FILE)
+    args = parser.parse_args()
+
+    table = build_feature_table(args.dump_location, args.output, args.sources)
+    if table is not None:
+        print(f"Feature table: {len(table)} news items -> '{args.output}'")
@@ -0,0 +1,138 @@
+"""
+Offline Batch Scoring
+Scores collected news content (or the dataset CSV titles) with the ML model
+across a process pool, optionally with cached fact checking, and writes one
+compact JSON-lines results file with per-item latency
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+
+from fact_checker import EnhancedFactChecker
+from model_bundle import load_model_files
+from news_corpus import NEWS_SOURCES, iter_csv_records, iter_dump_records, iter_batches
+
+# Per worker process state, set up once by init_worker
+_checker = None
+_fact_check = False
+_text_field = 'title'
+_fact_cache = {}
+
+
+def init_worker(fact_check, text_field):
+    global _checker, _fact_check, _text_field
+    model, vectorizer = load_model_files()
+    _checker = EnhancedFactChecker(model, vectorizer)
+    _fact_check = fact_check
+    _text_field = text_field
+
+
+def record_text(record, text_field):
+    if text_field == 'title+text':
+        return f"{record.get('title', '')} {record.get('text', '')}".strip()
+    return str(record.get(text_field) or '')
+
+
+def score_batch(records):
+    """Score a batch of records in a worker, returns compact result dicts"""
+    results = []
+    for record in records:
+        text = record_text(record, _text_field)
+        start = time.perf_counter()
+
+        ml_result = _checker.ml_prediction(text)
+        if _fact_check:
+            # Repeated headlines (same story from several outlets) are checked once per worker
+            if text not in _fact_cache:
+                _fact_cache[text] = _checker.verify_facts(text, None)
+            result = _checker.combine_signals(ml_result, _fact_cache[text])
+            prediction, confidence = result['final_prediction'], result['confidence']
+        else:
+            prediction, confidence = ml_result['prediction'].upper(), ml_result['confidence']
+
+        results.append({
+            'id': record['news_id'],
+            'source': record['source'],
+            'label': record['label'],
+            'prediction': prediction,
+            'confidence': round(float(confidence), 2),
+            'ml_prediction': ml_result['prediction'],
+            'latency_ms': round((time.perf_counter() - start) * 1000, 4)
+        })
+    return results
+
+
+def summarize(latencies, correct, total, elapsed):
+    latencies = np.array(latencies)
+    return {
+        'items': total,
+        'seconds': round(elapsed, 2),
+        'items_per_second': round(total / elapsed, 1) if elapsed else None,
+        'accuracy': round(correct / total, 4) if total else None,
+        'latency_ms_p50': round(float(np.percentile(latencies, 50)), 4) if total else None,
+        'latency_ms_p90': round(float(np.percentile(latencies, 90)), 4) if total else None,
+        'latency_ms_p99': round(float(np.percentile(latencies, 99)), 4) if total else None,
+        'latency_ms_max': round(float(latencies.max()), 4) if total else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score collected news with the fake news model")
+    parser.add_argument('--dump-location', help="Collected dataset folder (code/config.json dump_location)")
+    parser.add_argument('--dataset-dir', default='dataset', help="Used when --dump-location is not given")
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, choices=NEWS_SOURCES)
+    parser.add_argument('--text-field', default='title', choices=['title', 'text', 'title+text'])
+    parser.add_argument('--workers', type=int, default=None, help="Default: number of CPUs")
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="Batches queued to the pool at once (default: 2 per worker)")
+    parser.add_argument('--fact-check', action='store_true', help="Also run the free fact checker (network)")
+    parser.add_argument('--output', default='scores.jsonl')
+    args = parser.parse_args()
+
+    if args.dump_location:
+        records = iter_dump_records(args.dump_location, args.sources)
+    else:
+        if args.text_field != 'title':
+            parser.error("--text-field text needs --dump-location (the CSVs only have titles)")
+        records = iter_csv_records(args.dataset_dir, args.sources)
+
+    max_in_flight = args.max_in_flight or 2 * (args.workers or os.cpu_count() or 1)
+    latencies = []
+    correct = 0
+    start = time.perf_counter()
+
+    def write_results(results):
+        nonlocal correct
+        for result in results:
+            out.write(json.dumps(result, separators=(',', ':')) + '\n')
+            latencies.append(result['latency_ms'])
+            correct += result['prediction'] == result['label'].upper()
+
+    with Pool(args.workers, initializer=init_worker, initargs=(args.fact_check, args.text_field)) as pool, \
+            open(args.output, 'w', encoding='utf-8') as out:
+        # Bounded window of submitted batches: the corpus is read only as fast as it is scored
+        # (imap would queue the whole record stream up front)
+        in_flight = deque()
+        for batch in iter_batches(records, args.batch_size):
+            if len(in_flight) >= max_in_flight:
+                write_results(in_flight.popleft().get())
+            in_flight.append(pool.apply_async(score_batch, (batch,)))
+        while in_flight:
+            write_results(in_flight.popleft().get())
+
+    summary = summarize(latencies, correct, len(latencies), time.perf_counter() - start)
+
+    print(f"Scored {summary['items']} items in {summary['seconds']}s ({summary['items_per_second']} items/s)")
+    print(json.dumps(summary, indent=2))
+    print(f"Results saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
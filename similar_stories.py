@@ -0,0 +1,120 @@
+"""
+Similar Stories - top-k labeled dataset titles most similar to a text
+The L2-normalized TF-IDF vectors of all dataset titles (same vectorizer as
+the model) are saved next to the model bundle. A query is one sparse matrix
+product (cosine similarity with every title) plus a partial sort.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+from scipy import sparse
+
+from model_bundle import vocabulary_hash
+from near_duplicates import normalize, record_field
+
+SIMILAR_STORIES_DIR = 'similar_stories'
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+VECTORS_FILE = 'vectors.npz'
+RECORDS_FILE = 'records.json'
+
+
+def l2_normalize(X):
+    """Rows scaled to unit length (rows of zeros stay zero)"""
+    X = sparse.csr_matrix(X, dtype=np.float32)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ X
+
+
+def build_similar_story_index(records, vectorizer, path=SIMILAR_STORIES_DIR):
+    """Index labeled records ({'news_id', 'source', 'label', 'title', 'url'}), returns the number of titles"""
+    metadata = []
+    seen = set()
+    for record in records:
+        key = normalize(record['title'])
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        metadata.append({field: record_field(record, field) for field in ('news_id', 'source', 'label', 'title', 'url')})
+
+    vectors = l2_normalize(vectorizer.transform([record['title'] for record in metadata]))
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'size': len(metadata),
+        'n_features': vectors.shape[1],
+        # Identifies the vectorizer: after retraining, the old index must not be queried
+        'vocabulary_hash': vocabulary_hash(vectorizer)
+    }
+
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    # Stored as terms x titles: a query only touches the rows of its own terms
+    sparse.save_npz(os.path.join(tmp_path, VECTORS_FILE), vectors.T.tocsr(), compressed=False)
+    with open(os.path.join(tmp_path, RECORDS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False)
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return len(metadata)
+
+
+class SimilarStoryIndex:
+    def __init__(self, manifest, vectors, records):
+        self.manifest = manifest
+        self.vectors = vectors  # n_features x n_titles
+        self.records = records
+
+    def check_vectorizer(self, vectorizer):
+        """ValueError unless the index was built with this vectorizer's vocabulary"""
+        if vocabulary_hash(vectorizer) != self.manifest.get('vocabulary_hash'):
+            raise ValueError("Index was built with a different vocabulary, rebuild it with train_and_save_model.py")
+
+    def top_k(self, scores, k):
+        """Best k (index, score) of one row of cosine scores (sparse row: only titles sharing a term)"""
+        if scores.nnz == 0:
+            return []
+        data, indices = scores.data, scores.indices
+        if len(data) > k:
+            best = np.argpartition(-data, k)[:k]
+        else:
+            best = np.arange(len(data))
+        best = best[np.argsort(-data[best], kind='stable')]
+        return [dict(self.records[indices[i]], similarity=round(float(data[i]), 4)) for i in best]
+
+    def query_vectors(self, X, k=5):
+        """Top-k similar titles for every row of a TF-IDF matrix from the model's vectorizer"""
+        if X.shape[1] != self.vectors.shape[0]:
+            raise ValueError(f"Index was built with {self.vectors.shape[0]} features, the vectorizer has {X.shape[1]}")
+        scores = (l2_normalize(X) @ self.vectors).tocsr()
+        return [self.top_k(scores[i], k) for i in range(scores.shape[0])]
+
+
+def load_similar_story_index(path=SIMILAR_STORIES_DIR, vectorizer=None):
+    """
+    Index saved by train_and_save_model.py, None if it has not been built
+    With a vectorizer, ValueError if the index belongs to another vocabulary
+    """
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return None
+
+    with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format {manifest['format_version']} (expected {FORMAT_VERSION})")
+    with open(os.path.join(path, RECORDS_FILE), encoding='utf-8') as f:
+        records = json.load(f)
+
+    index = SimilarStoryIndex(manifest, sparse.load_npz(os.path.join(path, VECTORS_FILE)).tocsr(), records)
+    if vectorizer is not None:
+        index.check_vectorizer(vectorizer)
+    return index
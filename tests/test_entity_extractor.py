@@ -0,0 +1,36 @@
+import pytest
+
+from entity_extractor import load_gazetteer
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return load_gazetteer()
+
+
+@pytest.mark.parametrize('text, known', [
+    ("Senator Bernie Sanders Endorses Joe Biden", ['Bernie Sanders', 'Joe Biden']),
+    ("Actress Taylor Swift", ['Taylor Swift']),
+    ("U.S. President Joe Biden", ['Joe Biden']),
+    ("The WHO said", ['World Health Organization']),
+    ("Breaking News Donald Trump Meets Vladimir Putin", ['Donald Trump', 'Vladimir Putin']),
+])
+def test_known_names_inside_title_case_spans(extractor, text, known):
+    assert [name for name, _ in extractor.extract(text, fallback=False)] == known
+    entities = dict(extractor.extract(text))
+    assert all(entities[name] != 'unknown' for name in known)
+    assert not any(name in span for span, kind in entities.items() if kind == 'unknown' for name in known)
+
+
+def test_unknown_spans_stop_before_known_names(extractor):
+    assert extractor.extract("Senator Bernie Sanders Endorses Joe Biden") == [
+        ('Senator', 'unknown'), ('Bernie Sanders', 'person'), ('Endorses', 'unknown'), ('Joe Biden', 'person')]
+
+
+def test_acronyms_only_match_in_capitals(extractor):
+    assert extractor.extract("who knew the answer", fallback=False) == []
+    assert extractor.extract("Reports from the WHO", fallback=False) == [('World Health Organization', 'organization')]
+
+
+def test_unknown_capitalized_span(extractor):
+    assert extractor.extract("Local Farmer Wins Lottery") == [('Local Farmer Wins', 'unknown'), ('Lottery', 'unknown')]
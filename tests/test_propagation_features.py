@@ -0,0 +1,95 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from propagation_features import build_feature_table
+
+# Real tweet ids are beyond float64 precision, they must survive the merges exactly
+BASE_ID = 1322123456789012345
+
+
+def tweet(tweet_id, reply_to=None, user_id=1, followers=100, created_at='Mon Nov 02 10:00:00 +0000 2020'):
+    return {'id': tweet_id, 'created_at': created_at, 'in_reply_to_status_id': reply_to,
+            'user': {'id': user_id, 'followers_count': followers}}
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def add_news(dump, news_id, tweets=(), retweets=None, label='fake'):
+    news_dir = os.path.join(dump, 'politifact', label, news_id)
+    write_json(os.path.join(news_dir, 'news content.json'), {'title': news_id, 'publish_date': 1604300400})
+    for t in tweets:
+        write_json(os.path.join(news_dir, 'tweets', f"{t['id']}.json"), t)
+    for root_id, items in (retweets or {}).items():
+        write_json(os.path.join(news_dir, 'retweets', f"{root_id}.json"), {'retweets': items})
+    return news_dir
+
+
+def row(table, news_id):
+    return table.set_index('news_id').loc[news_id]
+
+
+@pytest.fixture
+def dump(tmp_path):
+    return str(tmp_path / 'dump')
+
+
+@pytest.fixture
+def output(tmp_path):
+    return str(tmp_path / 'features.csv')
+
+
+def test_no_replies(dump, output):
+    add_news(dump, 'politifact1', [tweet(BASE_ID)])
+    table = build_feature_table(dump, output, ['politifact'])
+    assert row(table, 'politifact1')['tweet_count'] == 1
+    assert row(table, 'politifact1')['cascade_depth_max'] == 0
+    assert row(table, 'politifact1')['time_to_first_share_hours'] == pytest.approx(3.0)
+
+
+def test_reply_chain(dump, output):
+    add_news(dump, 'politifact2',
+             [tweet(BASE_ID), tweet(BASE_ID + 1, reply_to=BASE_ID, user_id=2),
+              tweet(BASE_ID + 2, reply_to=BASE_ID + 1, user_id=3)],
+             retweets={BASE_ID: [{'created_at': 'Mon Nov 02 12:00:00 +0000 2020', 'user': {'id': 4, 'followers_count': 5},
+                                  'retweeted_status': {'id': BASE_ID}}]})
+    features = row(build_feature_table(dump, output, ['politifact']), 'politifact2')
+    assert features['tweet_count'] == 3
+    assert features['retweet_count'] == 1
+    assert features['unique_sharers'] == 4
+    assert features['cascade_size_max'] == 2
+    assert features['cascade_depth_max'] == 2
+    assert features['share_span_hours'] == pytest.approx(2.0)
+
+
+def test_news_without_tweets(dump, output):
+    add_news(dump, 'politifact3')
+    add_news(dump, 'politifact4', [tweet(BASE_ID)])
+    features = row(build_feature_table(dump, output, ['politifact']), 'politifact3')
+    assert features['tweet_count'] == 0
+    assert features['unique_sharers'] == 0
+    assert pd.isna(features['time_to_first_share_hours'])
+
+
+def test_incremental_run(dump, output):
+    news_dir = add_news(dump, 'politifact5', [tweet(BASE_ID), tweet(BASE_ID + 1, reply_to=BASE_ID, user_id=2)])
+    add_news(dump, 'politifact6', [tweet(BASE_ID + 10)])
+    build_feature_table(dump, output, ['politifact'])
+
+    # One more non-reply tweet in an already built news item
+    write_json(os.path.join(news_dir, 'tweets', f"{BASE_ID + 2}.json"), tweet(BASE_ID + 2, user_id=3))
+    later = os.stat(news_dir).st_mtime_ns + 10 ** 9
+    os.utime(os.path.join(news_dir, 'tweets'), ns=(later, later))
+
+    table = build_feature_table(dump, output, ['politifact'])
+    assert len(table) == 2
+    assert row(table, 'politifact5')['tweet_count'] == 3
+    assert row(table, 'politifact5')['cascade_depth_max'] == 1
+    assert row(table, 'politifact6')['tweet_count'] == 1
+    assert pd.read_csv(output)['news_id'].tolist().count('politifact5') == 1
@@ -0,0 +1,43 @@
+import re
+from argparse import Namespace
+
+import pandas as pd
+import pytest
+
+from news_corpus import is_holdout
+from train_streaming_model import evaluate_holdout, train
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    # Separable titles: every fake title mentions a hoax, every real one a report
+    for label, word in (('fake', 'shocking hoax exposed'), ('real', 'official report published')):
+        ids = [f'politifact_{label}_{i}' for i in range(200)]
+        pd.DataFrame({
+            'id': ids,
+            'news_url': [f'example.com/{news_id}' for news_id in ids],
+            'title': [f'{word} number {i}' for i in range(200)],
+            'tweet_ids': ''
+        }).to_csv(tmp_path / f'politifact_{label}.csv', index=False)
+    return tmp_path
+
+
+def make_args(dataset_dir, batch_size, epochs=2):
+    return Namespace(dataset_dir=str(dataset_dir), dump_location=None, sources=['politifact'], text_field='title',
+                     batch_size=batch_size, batch_chars=None, max_doc_chars=1000, epochs=epochs,
+                     n_features=2 ** 12, alpha=1e-4, holdout=0.2)
+
+
+@pytest.mark.parametrize('batch_size', [1000, 50])  # one batch per epoch, several batches per epoch
+def test_holdout_accuracy_reported_every_epoch(dataset_dir, batch_size, capsys):
+    args = make_args(dataset_dir, batch_size)
+    model, vectorizer = train(args)
+
+    expected = sum(is_holdout(f'politifact_{label}_{i}', args.holdout) for label in ('fake', 'real') for i in range(200))
+    epochs = re.findall(r'holdout accuracy (\S+) \((\d+) samples\)', capsys.readouterr().out)
+    assert len(epochs) == args.epochs
+    for accuracy, tested in epochs:
+        assert int(tested) == expected
+        assert float(accuracy) == 1.0
+
+    assert evaluate_holdout(model, vectorizer, args) == (expected, expected)
@@ -0,0 +1,100 @@
+"""
+Fast single-text scoring for TF-IDF + linear models
+idf x coef weights of every n-gram are precomputed into one lookup table, so
+a text is scored with a dict lookup + sum per n-gram instead of building a
+sparse matrix and going through sklearn's per-call validation
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+
+
+class LinearTextScorer:
+    """Label + probability of a TfidfVectorizer / binary linear model pair in one pass"""
+
+    def __init__(self, analyzer, table, intercept, classes, norm='l2', sublinear_tf=False, binary=False):
+        self.analyzer = analyzer
+        self.table = table  # n-gram -> (idf, idf * coef)
+        self.intercept = intercept
+        self.classes = classes
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+
+    @classmethod
+    def from_model(cls, model, vectorizer):
+        """
+        Build the scorer from a sklearn or bundle model/vectorizer pair
+        Returns None when the pair is not a TF-IDF + binary probabilistic linear model
+        """
+        coef = getattr(model, 'coef_', getattr(model, 'coef', None))
+        if coef is None or not hasattr(model, 'predict_proba'):
+            return None
+        coef = np.asarray(coef)
+        if coef.ndim == 2:
+            if coef.shape[0] != 1:
+                return None
+            coef = coef[0]
+        intercept = float(np.ravel(getattr(model, 'intercept_', getattr(model, 'intercept', 0.0)))[0])
+
+        if hasattr(vectorizer, 'terms'):
+            # BundleVectorizer
+            config = vectorizer.config
+            terms = [str(term) for term in vectorizer.terms]
+            idf = np.asarray(vectorizer.idf)
+            weights = idf * coef
+            table = {term: (float(idf[i]), float(weights[i])) for i, term in enumerate(terms)}
+            analyzer = vectorizer.analyze
+            norm, sublinear_tf, binary = config['norm'], config['sublinear_tf'], config['binary']
+        elif hasattr(vectorizer, 'vocabulary_') and hasattr(vectorizer, 'idf_'):
+            # sklearn TfidfVectorizer
+            idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(vectorizer.vocabulary_))
+            table = {term: (float(idf[i]), float(idf[i] * coef[i])) for term, i in vectorizer.vocabulary_.items()}
+            analyzer = vectorizer.build_analyzer()
+            norm, sublinear_tf, binary = vectorizer.norm, vectorizer.sublinear_tf, vectorizer.binary
+        else:
+            return None
+
+        return cls(analyzer, table, intercept, np.asarray(model.classes_), norm, sublinear_tf, binary)
+
+    def decision(self, text):
+        """Raw linear score of one text (same as model.decision_function)"""
+        table = self.table
+        dot = 0.0
+        squares = 0.0
+        total = 0.0
+
+        for term, tf in Counter(self.analyzer(text)).items():
+            entry = table.get(term)
+            if entry is None:
+                continue
+            if self.binary:
+                tf = 1
+            elif self.sublinear_tf:
+                tf = math.log(tf) + 1
+            idf, weight = entry
+            value = tf * idf
+            squares += value * value
+            total += abs(value)
+            dot += tf * weight
+
+        if self.norm == 'l2' and squares:
+            dot /= math.sqrt(squares)
+        elif self.norm == 'l1' and total:
+            dot /= total
+
+        return dot + self.intercept
+
+    def score(self, text):
+        """Returns (label, [p(classes[0]), p(classes[1])])"""
+        decision = self.decision(text)
+        if decision >= 0:
+            p = 1.0 / (1.0 + math.exp(-decision))
+        else:
+            z = math.exp(decision)
+            p = z / (1.0 + z)
+
+        label = self.classes[1] if decision > 0 else self.classes[0]
+        return label, np.array([1.0 - p, p])
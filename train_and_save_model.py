@@ -1,9 +1,11 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
-import pickle
+from model_bundle import save_bundle, BUNDLE_DIR
+from feature_cache import load_or_build_split, DEFAULT_VECTORIZER_PARAMS
+from near_duplicates import build_near_duplicate_index, NEAR_DUPLICATE_DIR
+from news_corpus import iter_csv_records
+from similar_stories import build_similar_story_index, SIMILAR_STORIES_DIR
 
 print("Training model and saving...")
 
@@ -33,18 +35,14 @@ print(f"Total samples: {len(data)}")
 X = data[text_column]
 y = data['label']
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
+# Split + vectorize (cached in feature_cache/ for repeated runs)
+print("\nVectorizing text...")
+vectorizer, X_train_vec, X_test_vec, y_train, y_test = load_or_build_split(
+    X, y, DEFAULT_VECTORIZER_PARAMS, test_size=0.2, random_state=42
 )
 
-print(f"Training set: {len(X_train)}")
-print(f"Test set: {len(X_test)}")
-
-# Vectorize
-print("\nVectorizing text...")
-vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
-X_train_vec = vectorizer.fit_transform(X_train)
-X_test_vec = vectorizer.transform(X_test)
+print(f"Training set: {X_train_vec.shape[0]}")
+print(f"Test set: {X_test_vec.shape[0]}")
 
 # Train model
 print("\nTraining Logistic Regression model...")
@@ -56,19 +54,28 @@ y_pred = model.predict(X_test_vec)
 accuracy = accuracy_score(y_test, y_pred)
 print(f"\nModel accuracy: {accuracy:.4f}")
 
-# Save model and vectorizer
+# Save model + vectorizer as one bundle
 print("\nSaving model...")
-with open('model.pkl', 'wb') as f:
-    pickle.dump(model, f)
+save_bundle(model, vectorizer, BUNDLE_DIR, metadata={
+    'accuracy': float(accuracy),
+    'text_column': text_column,
+    'train_samples': int(X_train_vec.shape[0])
+})
+
+# Near-duplicate index over all labeled dataset titles (known stories are answered directly)
+print("\nBuilding near-duplicate index...")
+indexed = build_near_duplicate_index(iter_csv_records('dataset'), NEAR_DUPLICATE_DIR)
 
-with open('vectorizer.pkl', 'wb') as f:
-    pickle.dump(vectorizer, f)
+# TF-IDF vectors of the same titles, for the top-k similar stories shown with a verdict
+print("Building similar stories index...")
+build_similar_story_index(iter_csv_records('dataset'), vectorizer, SIMILAR_STORIES_DIR)
 
 print("\n" + "="*60)
 print("SUCCESS!")
 print("="*60)
-print("Model saved to 'model.pkl'")
-print("Vectorizer saved to 'vectorizer.pkl'")
+print(f"Model bundle saved to '{BUNDLE_DIR}/'")
+print(f"Near-duplicate index ({indexed} titles) saved to '{NEAR_DUPLICATE_DIR}/'")
+print(f"Similar stories index saved to '{SIMILAR_STORIES_DIR}/'")
 print(f"Model accuracy: {accuracy:.4f}")
 print("\nNext step: Run 'streamlit run app.py'")
 print("="*60)
\ No newline at end of file
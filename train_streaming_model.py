@@ -0,0 +1,123 @@
+"""
+Streaming Training - full FakeNewsNet corpus (PolitiFact + GossipCop)
+HashingVectorizer + incremental SGD logistic regression (partial_fit) over
+chunked reads, training memory stays constant regardless of corpus size
+
+Trains on the CSV titles, or with --dump-location on the full article text
+collected by code/main.py
+"""
+
+import argparse
+import pickle
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from news_corpus import NEWS_SOURCES, LABEL_IDS, iter_csv_records, iter_dump_records, iter_batches, is_holdout
+
+CLASSES = np.array([0, 1])
+
+
+def build_vectorizer(n_features):
+    # Stateless: nothing is fitted, so it never has to see the whole corpus
+    return HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2')
+
+
+def record_text(record, text_field, max_doc_chars):
+    if text_field == 'title+text':
+        text = f"{record['title']} {record['text']}"
+    else:
+        text = str(record[text_field])
+    return text[:max_doc_chars]
+
+
+def iter_training_batches(args):
+    """Yield (texts, labels, holdout_mask) batches from the corpus"""
+    if args.dump_location:
+        records = iter_dump_records(args.dump_location, args.sources)
+    else:
+        records = iter_csv_records(args.dataset_dir, args.sources, chunksize=args.batch_size)
+
+    for batch in iter_batches(records, args.batch_size, args.batch_chars):
+        texts = [record_text(record, args.text_field, args.max_doc_chars) for record in batch]
+        labels = np.array([LABEL_IDS[record['label']] for record in batch])
+        holdout = np.array([is_holdout(record['news_id'], args.holdout) for record in batch])
+        yield texts, labels, holdout
+
+
+def evaluate_holdout(model, vectorizer, args):
+    """(correct, tested) on the held-out rows, one more streamed pass over the corpus"""
+    correct = 0
+    tested = 0
+    for texts, labels, holdout in iter_training_batches(args):
+        test_idx = np.flatnonzero(holdout)
+        if len(test_idx):
+            X = vectorizer.transform([texts[i] for i in test_idx])
+            correct += int((model.predict(X) == labels[test_idx]).sum())
+            tested += len(test_idx)
+    return correct, tested
+
+
+def train(args):
+    vectorizer = build_vectorizer(args.n_features)
+    model = SGDClassifier(loss='log_loss', alpha=args.alpha, random_state=42)
+    rng = np.random.RandomState(42)
+
+    for epoch in range(1, args.epochs + 1):
+        seen = 0
+
+        for texts, labels, holdout in iter_training_batches(args):
+            train_idx = np.flatnonzero(~holdout)
+            if len(train_idx):
+                X = vectorizer.transform([texts[i] for i in train_idx])
+                order = rng.permutation(len(train_idx))
+                model.partial_fit(X[order], labels[train_idx][order], classes=CLASSES)
+                seen += len(train_idx)
+
+        # Held-out rows never reach partial_fit; they are scored with the epoch-end model
+        # (also correct when an epoch is a single batch)
+        correct, tested = evaluate_holdout(model, vectorizer, args) if seen else (0, 0)
+        accuracy = correct / tested if tested else float('nan')
+        print(f"Epoch {epoch}: trained on {seen} samples, holdout accuracy {accuracy:.4f} ({tested} samples)")
+
+    return model, vectorizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core training on the full FakeNewsNet corpus")
+    parser.add_argument('--dataset-dir', default='dataset')
+    parser.add_argument('--dump-location', help="Train on the collected articles instead of the CSV titles")
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, choices=NEWS_SOURCES)
+    parser.add_argument('--text-field', default='title', choices=['title', 'text', 'title+text'])
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--batch-chars', type=int, default=20_000_000,
+                        help="Memory budget: close a batch once it holds this many characters")
+    parser.add_argument('--max-doc-chars', type=int, default=100_000, help="Truncate longer articles")
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--n-features', type=int, default=2 ** 20)
+    parser.add_argument('--alpha', type=float, default=1e-5)
+    parser.add_argument('--holdout', type=float, default=0.2, help="Fraction of news ids held out for testing")
+    parser.add_argument('--model-out', default='streaming_model.pkl')
+    parser.add_argument('--vectorizer-out', default='streaming_vectorizer.pkl')
+    args = parser.parse_args()
+
+    if args.text_field != 'title' and not args.dump_location:
+        parser.error("--text-field text needs --dump-location (the CSVs only have titles)")
+
+    print("Streaming training...")
+    print(f"Sources: {', '.join(args.sources)} | text: {args.text_field} | batch size: {args.batch_size}")
+
+    model, vectorizer = train(args)
+
+    with open(args.model_out, 'wb') as f:
+        pickle.dump(model, f)
+    with open(args.vectorizer_out, 'wb') as f:
+        pickle.dump(vectorizer, f)
+
+    print(f"\nModel saved to '{args.model_out}'")
+    print(f"Vectorizer saved to '{args.vectorizer_out}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,123 @@ Uses Brave Search API for real-time fact verification
 
 import requests
 import os
-from urllib.parse import quote
+import csv
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import quote, urlparse
+from lookup_cache import LookupCache, MISS
+from single_flight import SingleFlight
+
+SEARCH_CACHE_FILE = os.getenv('BRAVE_CACHE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'brave_cache.db'))
+MONTHLY_QUOTA = int(os.getenv('BRAVE_MONTHLY_QUOTA', '2000'))
+
+# Search results are kept for a week, stale ones are still served when the quota runs low.
+# The disk tier (and the quota counter, same file) is only created by the first search.
+search_cache = LookupCache(max_entries=5000, ttl=7 * 24 * 3600, negative_ttl=3600, disk_path=SEARCH_CACHE_FILE)
+
+_in_flight = SingleFlight()
+
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json"})
+
+
+def normalize_claim(claim):
+    """Cache key form of a claim: case, punctuation and spacing do not matter"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', claim.lower()).split())
+
+
+TRUSTED_DOMAINS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trusted_domains.csv')
+
+# Keywords indicating verification, matched as whole words with one compiled pattern
+TRUE_KEYWORDS = frozenset(['true', 'correct', 'accurate', 'verified', 'confirmed', 'yes'])
+FALSE_KEYWORDS = frozenset(['false', 'incorrect', 'wrong', 'fake', 'debunked', 'myth', 'no'])
+KEYWORD_PATTERN = re.compile(r'\b(?:' + '|'.join(sorted(TRUE_KEYWORDS | FALSE_KEYWORDS)) + r')\b')
+
+
+class TrustedDomains:
+    """Trust score by host, matched on domain suffixes (news.bbc.co.uk -> bbc.co.uk, not notsnopes.com -> snopes.com)"""
+    
+    def __init__(self, scores):
+        self.scores = {domain.lower().strip('.'): trust for domain, trust in scores.items()}
+    
+    @classmethod
+    def load(cls, path=TRUSTED_DOMAINS_FILE):
+        with open(path, encoding='utf-8', newline='') as f:
+            return cls({row['domain']: int(row['trust']) for row in csv.DictReader(f)})
+    
+    def trust(self, url):
+        """Trust level of the url's host, 0 if not trusted"""
+        host = (urlparse(url if '//' in url else '//' + url).hostname or '').rstrip('.')
+        labels = host.split('.')
+        # Longest suffix first: one dict lookup per label, whatever the list size
+        for i in range(len(labels) - 1):
+            trust = self.scores.get('.'.join(labels[i:]))
+            if trust is not None:
+                return trust
+        return 0
+
+
+@lru_cache(maxsize=None)
+def load_trusted_domains(path=TRUSTED_DOMAINS_FILE):
+    return TrustedDomains.load(path)
+
+
+class QuotaTracker:
+    """Monthly API query budget, counted in SQLite so threads and processes share it safely"""
+    
+    def __init__(self, path=SEARCH_CACHE_FILE, monthly_limit=MONTHLY_QUOTA, reserve=50):
+        self.path = path
+        self.monthly_limit = monthly_limit
+        # Queries kept back for claims that have never been searched
+        self.reserve = reserve
+        self.lock = threading.Lock()
+        # Opened on first use, once per process (nothing is created on import)
+        self._db = None
+        self._db_pid = None
+    
+    def _connection(self):
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS quota (month TEXT PRIMARY KEY, used INTEGER NOT NULL)")
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+    
+    def used(self):
+        with self.lock:
+            row = self._connection().execute("SELECT used FROM quota WHERE month = ?",
+                                             (time.strftime('%Y-%m'),)).fetchone()
+        return row[0] if row else 0
+    
+    def remaining(self):
+        return self.monthly_limit - self.used()
+    
+    def try_acquire(self, reserve=0):
+        """Count one query if more than reserve queries are left this month"""
+        month = time.strftime('%Y-%m')
+        with self.lock:
+            db = self._connection()
+            with db:
+                db.execute("INSERT OR IGNORE INTO quota VALUES (?, 0)", (month,))
+                # Check and increment in one statement: two processes can never both take the last query
+                cursor = db.execute("UPDATE quota SET used = used + 1 WHERE month = ? AND used < ?",
+                                    (month, self.monthly_limit - reserve))
+            return cursor.rowcount == 1
 
 class WebSearchFactChecker:
     """Fact checker using Brave Search API"""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, quota=None):
         """
         Initialize with Brave Search API key
         Get free API key: https://brave.com/search/api/
         Free tier: 2000 queries/month
         """
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY")
+        self.quota = quota or QuotaTracker()
         
         if not self.api_key:
             print("⚠️ Warning: No Brave API key found. Set BRAVE_API_KEY environment variable.")
@@ -34,17 +139,48 @@ class WebSearchFactChecker:
         
         # Construct search query optimized for fact-checking
         query = f'"{claim}" fact check OR verify OR true OR false'
+        
+        key = f"{normalize_claim(claim)}|{num_results}"
+        cached = search_cache.get(key)
+        if cached is not MISS:
+            return cached
+        
+        # Identical searches running at the same time share one API call (and one query of the quota)
+        return _in_flight.do(key, self._search_within_quota, key, query, num_results)
+    
+    def _search_within_quota(self, key, query, num_results):
+        """Search if the monthly budget allows it, else fall back to a stale cached result"""
+        stale = search_cache.get(key, allow_stale=True)
+        
+        # Claims with a stale result leave the reserve for claims never searched before
+        if not self.quota.try_acquire(reserve=self.quota.reserve if stale is not MISS else 0):
+            if stale is not MISS:
+                return dict(stale, stale=True)
+            return {
+                'found': False,
+                'error': 'Monthly search quota exhausted',
+                'results': []
+            }
+        
+        result = self._search(query, num_results)
+        if result['found']:
+            search_cache.set(key, result)
+        elif stale is not MISS:
+            return dict(stale, stale=True)
+        return result
+    
+    def _search(self, query, num_results):
+        """Brave Search API request"""
         encoded_query = quote(query)
         
         url = f"https://api.search.brave.com/res/v1/web/search?q={encoded_query}&count={num_results}"
         
         headers = {
-            "Accept": "application/json",
             "X-Subscription-Token": self.api_key
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _session.get(url, headers=headers, timeout=10)
             
             if response.status_code != 200:
                 return {
@@ -124,26 +260,7 @@ class WebSearchFactChecker:
     def _analyze_search_results(self, claim, results):
         """Analyze search results to determine claim accuracy"""
         
-        # Trusted fact-checking domains
-        trusted_domains = {
-            'snopes.com': 95,
-            'factcheck.org': 95,
-            'politifact.com': 90,
-            'fullfact.org': 90,
-            'reuters.com': 85,
-            'apnews.com': 85,
-            'bbc.com': 80,
-            'nytimes.com': 75,
-            'wikipedia.org': 70,
-            'nasa.gov': 95,
-            'noaa.gov': 90,
-            'cdc.gov': 90,
-            'nih.gov': 90
-        }
-        
-        # Keywords indicating verification
-        true_keywords = ['true', 'correct', 'accurate', 'verified', 'confirmed', 'yes']
-        false_keywords = ['false', 'incorrect', 'wrong', 'fake', 'debunked', 'myth', 'no']
+        trusted_domains = load_trusted_domains()
         
         trusted_sources = []
         total_trust_score = 0
@@ -151,30 +268,26 @@ class WebSearchFactChecker:
         false_signals = 0
         
         for result in results:
-            url = result['url'].lower()
             title = result['title'].lower()
             desc = result['description'].lower()
             
             # Check if from trusted domain
-            domain_trust = 0
-            for domain, trust_level in trusted_domains.items():
-                if domain in url:
-                    domain_trust = trust_level
-                    trusted_sources.append({
-                        'title': result['title'],
-                        'url': result['url'],
-                        'trust_level': trust_level,
-                        'snippet': result['description'][:150] + '...'
-                    })
-                    break
-            
+            domain_trust = trusted_domains.trust(result['url'])
             if domain_trust > 0:
+                trusted_sources.append({
+                    'title': result['title'],
+                    'url': result['url'],
+                    'trust_level': domain_trust,
+                    'snippet': result['description'][:150] + '...'
+                })
+                
                 # Analyze content
                 content = title + ' ' + desc
                 
-                # Count true/false indicators
-                true_count = sum(1 for keyword in true_keywords if keyword in content)
-                false_count = sum(1 for keyword in false_keywords if keyword in content)
+                # Count distinct true/false indicator words
+                keywords = set(KEYWORD_PATTERN.findall(content))
+                true_count = len(keywords & TRUE_KEYWORDS)
+                false_count = len(keywords & FALSE_KEYWORDS)
                 
                 if true_count > false_count:
                     true_signals += domain_trust
@@ -0,0 +1,69 @@
+"""
+Wikipedia Client - cached page summary lookups shared by all fact checkers
+Summaries are cached for a day, "not found" answers for an hour. Set
+WIKIPEDIA_CACHE_DB to a SQLite file to keep the cache across restarts
+and share it between processes.
+
+Wikipedia summaries are looked up in the local knowledge base first
+(knowledge_base.py, KNOWLEDGE_BASE_DB); the API is only the fallback, and is
+never called when WIKIPEDIA_OFFLINE=1.
+"""
+
+import os
+
+import requests
+
+from knowledge_base import KNOWLEDGE_BASE_FILE, open_knowledge_base
+from lookup_cache import LookupCache, MISS
+from single_flight import SingleFlight
+
+# Wikipedia REST page summary endpoint, {} is the page title
+WIKIPEDIA_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/{}"
+
+summary_cache = LookupCache(max_entries=10000, ttl=24 * 3600, negative_ttl=3600,
+                            disk_path=os.getenv('WIKIPEDIA_CACHE_DB'))
+
+local_knowledge_base = open_knowledge_base(os.getenv('KNOWLEDGE_BASE_DB', KNOWLEDGE_BASE_FILE))
+offline = os.getenv('WIKIPEDIA_OFFLINE') == '1'
+
+_in_flight = SingleFlight()
+
+_session = requests.Session()
+_session.headers.update({'User-Agent': 'FakeNewsDetector/1.0 (Educational Project)'})
+
+
+def fetch_wikipedia_summary(entity, session=None, summary_url=WIKIPEDIA_SUMMARY_URL, timeout=5):
+    """Page summary JSON of the entity, None if there is no such page or the request failed"""
+    url = summary_url.format(entity.replace(' ', '_'))
+    cached = summary_cache.get(url)
+    if cached is not MISS:
+        return cached
+
+    if local_knowledge_base is not None and summary_url == WIKIPEDIA_SUMMARY_URL:
+        data = local_knowledge_base.lookup(entity)
+        if data is not None:
+            summary_cache.set(url, data)
+            return data
+    if offline:
+        return None
+
+    # Concurrent misses for the same page share one request
+    return _in_flight.do(url, _request_summary, url, session or _session, timeout)
+
+
+def _request_summary(url, session, timeout):
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException:
+        return None  # transient, not cached
+
+    if response.status_code == 200:
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        summary_cache.set(url, data)
+        return data
+    if response.status_code == 404:
+        summary_cache.set(url, None)
+    return None